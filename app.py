@@ -1,12 +1,26 @@
+import time
+_rerun_started = time.perf_counter() # 재실행 1회 소요 시간 측정 시작
+
+import hashlib
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
 
-# 로컬 모듈 임포트
-from utils import set_korean_font, translate_to_korean, get_today_usd_to_krw_rate, format_currency
-from data_manager import YahooFinanceDataManager
+# 로컬 모듈 임포트 (plotly/openai/yfinance/matplotlib/deep_translator 등 무거운 의존성은 사용 시점에 로드)
+from import_profiler import import_report, record_rerun
+from instrumentation import metrics
+from utils import get_today_usd_to_krw_rate
+from data_manager import YahooFinanceDataManager, PRICE_DISPLAY_FORMATS
+from cache_backend import create_cache_backend
 from llm_service import OpenAIService
+from indicators import IndicatorEngine
+from chart import build_price_figure, build_comparison_figure, extend_price_figure, DEFAULT_MAX_POINTS
+from live_feed import LiveFeedHub, SimulatedQuoteFeed
+from prefetch import Prefetcher
+from backtest import STRATEGIES, run_backtest
+from screener import UniverseScreener, available_universes, screen, COLUMN_LABELS
+import views
 
 # Streamlit 페이지 설정
 st.set_page_config(
@@ -18,128 +32,148 @@ st.set_page_config(
 st.title("📊 범주별 기업 정보 조회")
 
 # 데이터 및 AI 서비스 객체 초기화
-data_manager = YahooFinanceDataManager()
+@st.cache_resource
+def get_data_manager() -> YahooFinanceDataManager:
+    """모든 세션이 공유하는 데이터 매니저 (캐시 백엔드는 STOCK_CACHE_BACKEND로 선택)"""
+    return YahooFinanceDataManager(cache=create_cache_backend())
+
+@st.cache_resource
+def get_ai_service() -> OpenAIService:
+    """OpenAI 클라이언트는 프로세스당 한 번만 생성 (키가 없으면 ValueError, 캐싱되지 않음)"""
+    return OpenAIService()
+
+data_manager = get_data_manager()
 try:
-    ai_service = OpenAIService()
+    ai_service = get_ai_service()
 except ValueError as e:
     st.error(f"AI 서비스 초기화 오류: {e}. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
     ai_service = None # 오류 발생 시 AI 서비스 사용 불가
 
+@st.cache_resource
+def get_prefetcher() -> Prefetcher:
+    """종목별 스냅샷은 프로세스 전체가 공유"""
+    return Prefetcher(data_manager)
+
 symbol = st.text_input("🔍 종목 코드 (예: AAPL)", value="AAPL").strip().upper()
 
+# 종목이 입력되면 기업 정보/환율/번역/기본 구간 주가를 동시에 미리 조회해 두고, 버튼은 이 스냅샷에서 바로 그립니다.
+snapshot = get_prefetcher().prefetch(symbol) if symbol else None
+
 # --- 범주별 버튼 조회 기능 ---
 
 if st.button("🏢 회사 기본 정보"):
-    info = data_manager.get_info(symbol)
+    info = snapshot.get("info") if snapshot else None
     if not info:
         st.error(f"'{symbol}'에 대한 데이터를 불러올 수 없습니다. 종목 코드를 확인해주세요.")
     else:
-        summary_en = info.get('longBusinessSummary', '')
-        summary_ko = translate_to_korean(summary_en)
-
-        st.subheader(f"{info.get('longName', '기업명 없음')} ({symbol})")
-        employees = info.get('fullTimeEmployees', None)
-        employees_str = f"{employees:,}명" if isinstance(employees, int) else "정보 없음"
-
-        st.markdown(f"""
-        - **산업군**: {info.get('industry', '정보 없음')}
-        - **섹터**: {info.get('sector', '정보 없음')}
-        - **설명 (한글 번역)**: {summary_ko}
-        - **주소**: {info.get('address1', '')}, {info.get('city', '')}, {info.get('state', '')} {info.get('zip', '')}, {info.get('country', '')}
-        - **웹사이트**: [{info.get('website', '')}]({info.get('website', '')})
-        - **직원 수**: {employees_str}
-        """)
+        title, body = views.company_overview(symbol, info, snapshot.get("summary_ko"))
+        st.subheader(title)
+        st.markdown(body)
 
 
 if st.button("💰 재무 요약"):
-    info = data_manager.get_info(symbol)
-    rate = get_today_usd_to_krw_rate()
+    info = snapshot.get("info") if snapshot else None
+    rate = snapshot.get("fx_rate") if snapshot else get_today_usd_to_krw_rate()
 
     if not info:
         st.error(f"'{symbol}'에 대한 데이터를 불러올 수 없습니다. 종목 코드를 확인해주세요.")
     else:
         st.subheader("💰 재무 요약")
-        st.markdown(f"""
-        - **총수익**: {format_currency(info.get('totalRevenue'), "USD", rate)}
-        - **순이익**: {format_currency(info.get('netIncomeToCommon'), "USD", rate)}
-        - **영업이익률**: {info.get('operatingMargins', 0) * 100:.2f}%
-        - **배당률**: {info.get('dividendYield', 0) * 100:.2f}%
-        - **EPS**: {info.get('trailingEps', 0):.2f}
-        - **현금 보유**: {format_currency(info.get('totalCash'), "USD", rate)}
-        - **총 부채**: {format_currency(info.get('totalDebt'), "USD", rate)}
-        - **부채비율**: {info.get('debtToEquity', 0):.2f}%
-        """)
+        st.markdown(views.financial_summary(info, rate))
 
 # 임원 요약 버튼 클릭 시
 if st.button("🧑‍💼 임원 요약"):
-    info = data_manager.get_info(symbol)
-    officers = info.get("companyOfficers", []) if info else []
-    if not officers:
+    info = snapshot.get("info") if snapshot else None
+    if not (info or {}).get("companyOfficers"):
         st.warning("임원 정보가 없습니다.")
     else:
-        # 상위 5명만 표시
-        top_officers = sorted(officers, key=lambda x: x.get('totalPay', 0), reverse=True)[:5]
-        data = []
-        for officer in top_officers:
-            name = officer.get("name", "")
-            title = officer.get("title", "")
-            pay = officer.get("totalPay", 0)
-            formatted_pay = format_currency(pay, currency="USD", rate=get_today_usd_to_krw_rate())
-            data.append({
-                "이름": name,
-                "직책": title,
-                "연봉 (USD)": formatted_pay
-            })
-        df = pd.DataFrame(data)
+        # 상위 5명만 표시 (환율은 표를 만들기 전에 한 번만 조회)
+        df = views.top_officers(info, snapshot.get("fx_rate"))
         st.subheader("🧑‍💼 상위 임원")
         st.dataframe(df, hide_index=True)
 
 if st.button("📈 투자 지표"):
-    info = data_manager.get_info(symbol)
+    info = snapshot.get("info") if snapshot else None
     if not info:
         st.error(f"'{symbol}'에 대한 데이터를 불러올 수 없습니다. 종목 코드를 확인해주세요.")
     else:
         st.subheader("📈 투자 지표")
-        st.markdown(f"""
-        - **PER (Trailing)**: {info.get('trailingPE', 0):.2f}
-        - **PER (Forward)**: {info.get('forwardPE', 0):.2f}
-        - **PBR**: {info.get('priceToBook', 0):.2f}
-        - **ROE**: {info.get('returnOnEquity', 0) * 100:.2f}%
-        - **ROA**: {info.get('returnOnAssets', 0) * 100:.2f}%
-        - **Beta**: {info.get('beta', 0):.2f}
-        """)
+        st.markdown(views.investment_metrics(info))
 
 if st.button("📊 주가/시장 정보"):
-    info = data_manager.get_info(symbol)
-    rate = get_today_usd_to_krw_rate()
+    info = snapshot.get("info") if snapshot else None
+    rate = snapshot.get("fx_rate") if snapshot else get_today_usd_to_krw_rate()
     if not info:
         st.error(f"'{symbol}'에 대한 데이터를 불러올 수 없습니다. 종목 코드를 확인해주세요.")
     else:
         st.subheader("📊 주가/시장 정보")
-        st.markdown(f"""
-        - **현재가**: ${info.get('currentPrice', 0):.2f}
-        - **전일 종가**: ${info.get('previousClose', 0):.2f}
-        - **고가 / 저가 (당일)**: \\${info.get('dayHigh', 0):.2f} / \\${info.get('dayLow', 0):.2f}
-        - **52주 최고 / 최저**: \\${info.get('fiftyTwoWeekHigh', 0):.2f} / \\${info.get('fiftyTwoWeekLow', 0):.2f}
-        - **시가총액**:  {format_currency(info.get('marketCap'), "USD", rate)}
-        - **유통주식수**: {info.get('sharesOutstanding', 0):,}주
-        - **거래량 (당일)**: {info.get('volume', 0):,}주
-        """)
+        st.markdown(views.market_summary(info, rate))
 
         # {format_currency(info.get('marketCap'), "KRW")}
 
+@st.cache_resource
+def get_live_hub() -> LiveFeedHub:
+    """실시간 시세 스트림은 프로세스 전체가 공유 (LIVE_FEED=fake이면 가짜 시세 피드로 항상 장중처럼 동작)"""
+    if os.getenv("LIVE_FEED") == "fake":
+        return LiveFeedHub(SimulatedQuoteFeed(), market_clock=lambda symbol: True)
+    return LiveFeedHub()
+
+if st.toggle("📡 실시간 시세 (장중 1분봉)", key="live_mode"):
+    live_stream = get_live_hub().subscribe(symbol)
+
+    # 이 영역만 주기적으로 다시 실행해, 새 봉을 기존 차트에 이어 붙입니다. (페이지 전체 재실행/히스토리 재조회 없음)
+    @st.fragment(run_every=2)
+    def live_quote_panel():
+        version, bars = live_stream.snapshot()
+        if bars.empty:
+            st.caption(f"{symbol} 시세 대기 중... ({live_stream.status})")
+            return
+
+        live = st.session_state.get("live_chart")
+        if live is None or live["symbol"] != symbol:
+            live = {"symbol": symbol, "version": version, "last": bars.index[-1],
+                    "fig": build_price_figure(bars, hover_unit="")}
+            st.session_state["live_chart"] = live
+        elif version != live["version"]:
+            extend_price_figure(live["fig"], bars.loc[bars.index >= live["last"]])
+            live.update(version=version, last=bars.index[-1])
+
+            # 같은 종목의 일봉이 오늘까지 조회되어 있으면 오늘 봉만 갱신합니다. (지표는 뒤쪽만 재계산)
+            # 과거 구간만 조회한 경우에는 공백 뒤에 오늘 봉이 붙지 않도록 건너뜁니다.
+            engine = st.session_state.get("indicator_engine")
+            daily_bar = live_stream.daily_bar()
+            latest_end = st.session_state.get("latest_end_date")
+            if (
+                engine is not None
+                and st.session_state.get("latest_symbol") == symbol
+                and latest_end is not None and latest_end >= datetime.today().date()
+                and daily_bar.index[0] >= engine.bars.index[-1]
+            ):
+                engine.update(daily_bar)
+                # 표/차트/AI Q&A가 같은 일봉을 보도록 세션 주가 데이터도 함께 바꿉니다.
+                st.session_state["raw_price_data"] = engine.bars
+                st.session_state["latest_adjusted_end"] = f"{daily_bar.index[0]:%Y-%m-%d}"
+
+        last_close = float(bars["Close"].iloc[-1])
+        day_open = float(live_stream.daily_bar()["Open"].iloc[0])
+        status = {"live": "🟢 장중", "closed": "⏸️ 장 마감 (개장 시 자동 재개)", "error": "⚠️ 조회 오류 (재시도 중)"}
+        st.metric(
+            f"{symbol} 현재가 ({bars.index[-1]:%H:%M})",
+            f"{last_close:,.2f}",
+            f"{(last_close / day_open - 1) * 100:+.2f}% (시가 대비)",
+        )
+        st.caption(f"{status.get(live_stream.status, live_stream.status)} · 다음 조회까지 약 {live_stream.interval:.0f}초")
+        st.plotly_chart(live["fig"], use_container_width=True, key="live_chart_plot")
+
+    live_quote_panel()
+
 if st.button("🧠 분석가 의견"):
-    info = data_manager.get_info(symbol)
+    info = snapshot.get("info") if snapshot else None
     if not info:
         st.error(f"'{symbol}'에 대한 데이터를 불러올 수 없습니다. 종목 코드를 확인해주세요.")
     else:
         st.subheader("🧠 분석가 의견")
-        st.markdown(f"""
-        - **추천 평균 등급**: {info.get('recommendationMean', 'N/A')} ({info.get('recommendationKey', 'N/A')})
-        - **분석가 수**: {info.get('numberOfAnalystOpinions', 'N/A')}
-        - **목표 주가 평균**: ${info.get('targetMeanPrice', 0):.2f}
-        - **목표 주가 상/하**: ${info.get('targetHighPrice', 0):.2f} / ${info.get('targetLowPrice', 0):.2f}
-        """)
+        st.markdown(views.analyst_opinion(info))
 
 # ✅ 주가 히스토리 조회
 st.divider()
@@ -149,6 +183,8 @@ today = datetime.today()
 
 start_date = st.date_input("시작일", value=today - timedelta(days=7), key="start_date_hist")
 end_date = st.date_input("종료일", value=today, key="end_date_hist")
+show_krw = st.checkbox("💱 차트를 원화(KRW) 환산 가격으로 표시 (USD 종목)", key="show_krw")
+overlays = st.multiselect("📐 차트 보조지표", list(views.OVERLAY_COLUMNS), key="chart_overlays")
 
 # app.py 파일의 해당 부분 수정
 if st.button("📈 주가 데이터 조회"):
@@ -156,70 +192,235 @@ if st.button("📈 주가 데이터 조회"):
         st.warning("⚠️ 시작일은 종료일보다 앞서야 합니다.")
     else:
         with st.spinner("데이터 불러오는 중..."):
-            raw_df, adjusted_end = data_manager.get_price_data_adjusted(
-                symbol,
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+            # 기본 구간은 종목 입력 시 미리 조회해 둔 결과를 사용
+            price_df, adjusted_end = views.load_price_history(
+                data_manager, symbol, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), snapshot
             )
-        
-        if raw_df is None or raw_df.empty:
+
+        if price_df is None:
             st.error("30일 이내에 해당 종목의 주가 데이터를 찾을 수 없습니다. 종목 코드 또는 기간을 확인해주세요.")
-            # 디버깅을 위한 print 추가 (Streamlit 콘솔에 출력)
-            print(f"Debug: No data found for {symbol} from {start_date} to {end_date}.")
-            print(f"Debug: raw_df is None or empty: {raw_df is None or raw_df.empty}")
         else:
-            st.success(f"📅 {adjusted_end}까지 데이터 불러오기 성공")
-            
-            # --- raw_df 컬럼 평탄화 추가 ---
-            # yfinance가 멀티 레벨 컬럼을 반환할 수 있으므로, 여기서 평탄화
-            raw_df.columns = [col[0] if isinstance(col, tuple) else col for col in raw_df.columns]
-            # --- 여기까지 추가/수정 ---
-
-            # 디버깅을 위한 print 추가 (Streamlit 콘솔에 출력)
-            print(f"Debug: Raw DataFrame columns after flattening: {raw_df.columns}")
-            print(f"Debug: Raw DataFrame head after flattening:\n{raw_df.head()}")
-            
-            # dtype 확인 라인 수정: raw_df.dtypes['Close'] 사용
-            if 'Close' in raw_df.columns:
-                print(f"Debug: raw_df['Close'] Dtype: {raw_df.dtypes['Close']}")
-            else:
-                print(f"Debug: 'Close' column not found in raw_df.")
-
-
-            display_df = data_manager.process_price_df(raw_df.copy()) # 원본 raw_df를 건드리지 않도록 copy() 사용
-
-            st.session_state["latest_df"] = display_df # AI Q&A를 위해 포맷팅된 df 저장
             st.session_state["latest_symbol"] = symbol
             st.session_state["latest_start_date"] = start_date
             st.session_state["latest_end_date"] = end_date
-            st.session_state["raw_price_data"] = raw_df # AI Q&A를 위해 원본 데이터도 저장
+            st.session_state["latest_adjusted_end"] = adjusted_end
+            st.session_state["raw_price_data"] = price_df # AI Q&A를 위해 숫자형 데이터 저장
+
+            # 기술 지표는 한 번만 계산해 차트 보조지표와 AI 요약 통계에 함께 사용
+            st.session_state["indicator_engine"] = IndicatorEngine(price_df)
+            # 이전 데이터로 계산한 백테스트 결과는 버립니다.
+            st.session_state.pop("backtest_results", None)
+            st.session_state.pop("backtest_sweep", None)
+
+# 조회한 데이터는 세션에 남아 있으므로, 보조지표/확대 구간을 바꿔 재실행해도 다시 받지 않고 그립니다.
+price_df = st.session_state.get("raw_price_data")
+if price_df is not None and not price_df.empty:
+    latest_symbol = st.session_state.get("latest_symbol", "")
+    st.success(f"📅 {latest_symbol}: {st.session_state.get('latest_adjusted_end')}까지 데이터 불러오기 성공")
+
+    # 표시 형식은 렌더링 시점에만 적용
+    st.dataframe(
+        price_df,
+        column_config={
+            "_index": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+            **{col: st.column_config.NumberColumn(col, format=fmt) for col, fmt in PRICE_DISPLAY_FORMATS.items()},
+        },
+    )
 
-            # 출력 (인덱스 숨기기!)
-            st.dataframe(display_df, hide_index=True)
+    st.subheader("📊 Chart")
 
-            st.subheader("📊 Chart")
+    # 다운샘플링되는 긴 구간은 확대 구간을 고르면 해당 구간을 원본 해상도에서 다시 샘플링합니다.
+    chart_window = price_df
+    if len(price_df) > DEFAULT_MAX_POINTS:
+        first_day, last_day = price_df.index[0].date(), price_df.index[-1].date()
+        zoom_start, zoom_end = st.slider(
+            "🔍 차트 확대 구간",
+            min_value=first_day,
+            max_value=last_day,
+            value=(first_day, last_day),
+            key=f"chart_zoom_{latest_symbol}_{first_day}_{last_day}"
+        )
+        chart_window = price_df.loc[str(zoom_start):str(zoom_end)]
 
-            set_korean_font()
+    # 원화 환산 시 일별 환율 시계열을 한 번에 곱해 변환 (보조지표도 같은 비율로 환산)
+    fig = views.price_chart(chart_window, st.session_state.get("indicator_engine"), overlays, show_krw)
+    st.plotly_chart(fig, use_container_width=True)
 
-            # Plotly 그래프 구성
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=raw_df.index, # 날짜가 인덱스
-                y=raw_df["Close"], # float 타입 그대로 사용
-                mode='lines+markers',
-                hovertemplate="날짜: %{x}<br>종가: %{y:.2f}원"
-            ))
 
-            fig.update_layout(
-                xaxis_title="",
-                yaxis_title="",
-                showlegend=False,
-                margin=dict(l=20, r=20, t=20, b=40),
-                height=500
+# ✅ 전략 백테스트 (조회한 주가 데이터 기반)
+st.divider()
+st.subheader("🧪 전략 백테스트")
+
+if price_df is None or price_df.empty:
+    st.info("먼저 '주가 데이터 조회' 버튼으로 종목 데이터를 조회해주세요.")
+else:
+    strategy_names = st.multiselect(
+        "전략", list(STRATEGIES), default=list(STRATEGIES),
+        format_func=lambda name: STRATEGIES[name][2], key="backtest_strategies"
+    )
+    col_fast, col_slow, col_lower, col_upper = st.columns(4)
+    ma_fast = col_fast.number_input("단기 이평", min_value=2, value=20, step=1, key="bt_fast")
+    ma_slow = col_slow.number_input("장기 이평", min_value=3, value=60, step=1, key="bt_slow")
+    rsi_lower = col_lower.number_input("RSI 매수", min_value=1, max_value=99, value=30, key="bt_rsi_lower")
+    rsi_upper = col_upper.number_input("RSI 매도", min_value=1, max_value=99, value=70, key="bt_rsi_upper")
+    params = {
+        "buy_and_hold": {},
+        "ma_crossover": {"fast": int(ma_fast), "slow": int(ma_slow)},
+        "rsi_threshold": {"lower": rsi_lower, "upper": rsi_upper},
+    }
+
+    if st.button("🧪 백테스트 실행"):
+        st.session_state["backtest_results"] = views.run_strategies(price_df, strategy_names, params)
+
+    with st.expander("🔬 파라미터 탐색 (이동평균 교차)"):
+        col_a, col_b = st.columns(2)
+        fast_range = col_a.slider("단기 이평 범위", 2, 100, views.DEFAULT_SWEEP_FAST, key="sweep_fast")
+        slow_range = col_b.slider("장기 이평 범위", 10, 400, views.DEFAULT_SWEEP_SLOW, key="sweep_slow")
+        step = st.number_input("간격", min_value=1, value=views.DEFAULT_SWEEP_STEP, key="sweep_step")
+        if st.button("🔬 탐색 실행"):
+            with st.spinner("파라미터 조합을 계산하는 중..."):
+                st.session_state["backtest_sweep"] = views.ma_sweep(price_df, fast_range, slow_range, step)
+
+        sweep_df = st.session_state.get("backtest_sweep")
+        if sweep_df is not None and not sweep_df.empty:
+            st.caption(f"{len(sweep_df)}개 조합 중 샤프 지수 상위 10개")
+            st.dataframe(sweep_df.head(10), hide_index=True)
+            best = sweep_df.iloc[0]
+            if st.button(f"최적 조합(fast={int(best['fast'])}, slow={int(best['slow'])}) 결과에 추가"):
+                st.session_state.setdefault("backtest_results", []).append(
+                    run_backtest(price_df, "ma_crossover", fast=int(best["fast"]), slow=int(best["slow"]))
+                )
+
+    backtest_results = st.session_state.get("backtest_results")
+    if backtest_results:
+        # 자산 곡선을 누적 수익률(%)로 바꿔 종목 비교 차트와 같은 방식으로 그립니다.
+        equity_fig, summary_df = views.backtest_report(backtest_results)
+        st.plotly_chart(equity_fig, use_container_width=True)
+        st.dataframe(summary_df, hide_index=True)
+        st.caption("결과는 아래 AI 질문에 함께 전달됩니다.")
+
+
+# ✅ 여러 종목 비교
+st.divider()
+st.subheader("🆚 종목 비교 (누적 수익률)")
+
+compare_input = st.text_input("비교할 종목 코드 (쉼표로 구분, 예: AAPL, MSFT, 005930.KS)", value="AAPL, MSFT, GOOGL", key="compare_symbols")
+compare_symbols = [s.strip().upper() for s in compare_input.split(",") if s.strip()]
+
+if st.button("🆚 종목 비교 조회"):
+    if start_date >= end_date:
+        st.warning("⚠️ 시작일은 종료일보다 앞서야 합니다.")
+    elif not compare_symbols:
+        st.warning("⚠️ 비교할 종목 코드를 입력해주세요.")
+    else:
+        with st.spinner(f"{len(compare_symbols)}개 종목 데이터를 동시에 불러오는 중..."):
+            frames = data_manager.get_price_data_batch(
+                compare_symbols,
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d")
             )
+            infos = data_manager.get_info_batch(list(frames))
+
+        missing = [s for s in compare_symbols if s not in frames]
+        if missing:
+            st.warning(f"데이터를 찾을 수 없는 종목: {', '.join(missing)}")
+
+        if frames:
+            returns = data_manager.normalized_returns(frames)
+
+            fig = build_comparison_figure(returns)
             st.plotly_chart(fig, use_container_width=True)
 
+            summary = pd.DataFrame({
+                "종목": returns.columns,
+                "기업명": [(infos.get(s) or {}).get('longName', '') for s in returns.columns],
+                "누적 수익률 (%)": returns.iloc[-1].round(2).values,
+            })
+            st.dataframe(summary, hide_index=True)
+
+
+# ✅ 종목 스크리너
+st.divider()
+st.subheader("🔎 종목 스크리너 (PER/PBR/ROE/배당률/목표가 상승여력)")
+
+@st.cache_resource
+def get_screener(name: str, symbols: tuple[str, ...] | None = None) -> UniverseScreener:
+    """종목 목록별 수집 작업은 프로세스당 하나만 두고 모든 세션이 진행 상황과 결과를 공유"""
+    return UniverseScreener(data_manager, name, list(symbols) if symbols else None)
+
+universe_choice = st.selectbox("종목 목록", [*available_universes(), "직접 입력"], key="screener_universe")
+if universe_choice == "직접 입력":
+    custom_input = st.text_input("종목 코드 (쉼표로 구분)", value="AAPL, MSFT, NVDA, 005930.KS", key="screener_custom")
+    custom_symbols = tuple(dict.fromkeys(s.strip().upper() for s in custom_input.split(",") if s.strip()))
+    # 입력한 종목 구성마다 별도의 테이블 파일을 사용합니다.
+    custom_name = "custom-" + hashlib.sha1(",".join(custom_symbols).encode("utf-8")).hexdigest()[:8]
+    screener = get_screener(custom_name, custom_symbols) if custom_symbols else None
+else:
+    screener = get_screener(universe_choice)
+
+if screener is not None:
+    col_start, col_stop, col_refresh = st.columns(3)
+    if col_start.button("▶️ 수집 시작/재개", key="screener_start"):
+        if not screener.start():
+            st.info("이미 수집 중이거나 최근에 모두 수집했습니다.")
+    if col_stop.button("⏸️ 수집 중지", key="screener_stop"):
+        screener.stop()
+    if col_refresh.button("🔄 전체 다시 수집", key="screener_refresh"):
+        screener.start(refresh=True)
+
+    # 수집 진행 상황만 주기적으로 다시 그립니다. (페이지 전체를 재실행하지 않음)
+    @st.fragment(run_every=2)
+    def screener_progress():
+        progress = screener.progress()
+        done = progress["collected"] + progress["failed"]
+        st.progress(min(done / max(progress["total"], 1), 1.0),
+                    text=f"수집 {progress['collected']}/{progress['total']} · 실패 {progress['failed']}"
+                         + (f" · 남은 종목 {progress['pending']}" if progress["running"] else ""))
+
+    screener_progress()
+
+    with st.expander("필터 조건", expanded=True):
+        col_a, col_b, col_c = st.columns(3)
+        per_max = col_a.number_input("PER 최대", min_value=0.0, value=30.0, step=1.0, key="screener_per_max")
+        pbr_max = col_b.number_input("PBR 최대", min_value=0.0, value=5.0, step=0.5, key="screener_pbr_max")
+        roe_min = col_c.number_input("ROE 최소 (%)", value=10.0, step=1.0, key="screener_roe_min")
+        col_d, col_e, col_f = st.columns(3)
+        dividend_min = col_d.number_input("배당률 최소 (%)", min_value=0.0, value=0.0, step=0.5, key="screener_div_min")
+        upside_min = col_e.number_input("목표가 상승여력 최소 (%)", value=0.0, step=5.0, key="screener_upside_min")
+        sort_by = col_f.selectbox("정렬 기준", ["upside", "per", "pbr", "roe", "dividend_yield", "market_cap"],
+                                  format_func=COLUMN_LABELS.get, key="screener_sort")
+
+    table = screener.table()
+    ranges = {
+        "per": (0.0, per_max),
+        "pbr": (0.0, pbr_max),
+        "roe": (roe_min / 100, None),
+        "upside": (upside_min / 100, None),
+    }
+    if dividend_min > 0:
+        ranges["dividend_yield"] = (dividend_min / 100, None)
+    result = screen(table, ranges, sort_by=sort_by, ascending=sort_by in ("per", "pbr"), limit=100)
+
+    st.caption(f"조건에 맞는 종목 {len(result)}개 / 수집된 종목 {len(table)}개")
+    if not result.empty:
+        display = result.drop(columns=["fetched_at"]).copy()
+        for column in ("roe", "dividend_yield", "upside"):
+            display[column] = display[column] * 100
+        st.dataframe(
+            display,
+            column_config={
+                "_index": st.column_config.TextColumn(COLUMN_LABELS["symbol"]),
+                **{col: st.column_config.NumberColumn(COLUMN_LABELS[col], format="%.2f")
+                   for col in ("price", "per", "forward_per", "pbr", "target_price")},
+                **{col: st.column_config.NumberColumn(COLUMN_LABELS[col], format="%.2f%%")
+                   for col in ("roe", "dividend_yield", "upside")},
+                "market_cap": st.column_config.NumberColumn(COLUMN_LABELS["market_cap"], format="%.3e"),
+                "name": COLUMN_LABELS["name"],
+                "sector": COLUMN_LABELS["sector"],
+                "currency": COLUMN_LABELS["currency"],
+            },
+        )
+
 
 # ----------------------------------
 # AI Q&A 히스토리 및 ENTER 실행 지원
@@ -242,40 +443,22 @@ with st.form("ai_qa_form", clear_on_submit=True):
     submitted = st.form_submit_button("AI에게 질문하기")
 
 if submitted and ai_service: # ai_service가 초기화된 경우에만 실행
-    # AI Q&A를 위해 가공되지 않은 raw_price_data를 활용하는 것이 좋습니다.
-    # AI가 숫자 계산을 더 잘하도록 Volume은 정수로 변환 후 to_string
     raw_price_data = st.session_state.get("raw_price_data")
     symbol_for_ai = st.session_state.get("latest_symbol", "")
     start_date_for_ai = st.session_state.get("latest_start_date")
     end_date_for_ai = st.session_state.get("latest_end_date")
 
     if raw_price_data is not None and not raw_price_data.empty:
-        # AI에게 전달할 데이터는 숫자형 그대로 유지 (Open, High, Low, Close, Volume)
-        # 인덱스(날짜)를 컬럼으로 추가
-        df_for_ai = raw_price_data.reset_index()
-        df_for_ai['Date'] = df_for_ai['Date'].dt.strftime('%Y-%m-%d')
-        # Volume 컬럼은 정수로 변환하여 AI가 숫자임을 명확히 인지하도록 함
-        if 'Volume' in df_for_ai.columns:
-            df_for_ai['Volume'] = df_for_ai['Volume'].astype(int)
-        
-        # AI에게 필요한 컬럼만 선택
-        df_text = df_for_ai[["Date", "Open", "High", "Low", "Close", "Volume"]].to_string(index=False)
-
-        prompt = f"""
-아래는 {symbol_for_ai}의 {start_date_for_ai}부터 {end_date_for_ai}까지의 주가 데이터입니다.
-이 데이터는 날짜(Date), 시가(Open), 고가(High), 저가(Low), 종가(Close), 거래량(Volume)을 포함합니다.
-
---- 주가 데이터 시작 ---
-{df_text}
---- 주가 데이터 끝 ---
-당신의 이름은 David입니다.
-위의 실제 데이터에 기반하여 아래 질문에 데이터 분석가처럼 상세하게 답해주세요.
-단, 답변은 한국어로 해주세요.
-
-질문: {user_question}
-"""
-        with st.spinner("AI가 데이터를 바탕으로 답변 생성 중..."):
-            answer = ai_service.get_qa_response(prompt, model="gpt-4o") # 모델명을 "gpt-4o" 또는 "gpt-4"로 변경
+        # 답변을 토큰 단위로 스트리밍해 표시하고, 완료 후에는 아래 히스토리에서 보여줍니다.
+        stream_placeholder = st.empty()
+        with stream_placeholder.container():
+            answer = st.write_stream(views.stream_ai_answer(
+                ai_service, symbol_for_ai, start_date_for_ai, end_date_for_ai, raw_price_data, user_question,
+                indicators=st.session_state.get("indicator_engine"),
+                backtests=st.session_state.get("backtest_results"),
+                model="gpt-4o", # 모델명을 "gpt-4o" 또는 "gpt-4"로 변경
+            ))
+        stream_placeholder.empty()
         
         # 히스토리에 Q&A 추가
         st.session_state["chat_history"].append({"user": user_question, "David": answer})
@@ -290,4 +473,21 @@ for item in reversed(st.session_state["chat_history"]):
     st.markdown(f"""
 **사용자:** {item.get('user', '')}
 > **David:** {str(item.get('David', ''))}
-""")
\ No newline at end of file
+""")
+
+# ----------------------------------
+# 시작/재실행 성능 및 디버그 지표 (사이드바)
+# ----------------------------------
+with st.sidebar.expander("⏱️ 시작/재실행 성능"):
+    st.json(import_report())
+
+with st.sidebar.expander("🛠️ 디버그: 단계별 성능 지표"):
+    st.caption("외부 호출/로컬 처리 단계별 지연 시간")
+    st.dataframe(pd.DataFrame(metrics.stage_summary()), hide_index=True)
+    st.caption("캐시 적중률")
+    st.dataframe(pd.DataFrame(metrics.cache_summary()), hide_index=True)
+    st.caption("카운터 (재시도/백트랙/오류)")
+    st.json(metrics.counters())
+    st.download_button("Prometheus 형식 내보내기", metrics.render_prometheus(), file_name="metrics.prom", mime="text/plain")
+
+record_rerun(_rerun_started)
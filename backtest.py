@@ -0,0 +1,212 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from indicators import TRADING_DAYS, rsi, sma
+from instrumentation import timed
+
+# 매수/매도 1회당 거래 비용 (수수료 + 슬리피지, 거래 금액 대비 비율)
+DEFAULT_FEE = 0.001
+
+# 작업 프로세스 하나에 맡길 최소 작업량 (조합 수 × 봉 수). 현재 프로세스에서 1~2초 정도 걸리는 양입니다.
+# (조합×봉당 약 35~100ns 측정) spawn으로 띄운 작업 프로세스는 pandas를 다시 임포트하느라 각각 0.5초 이상 걸리므로,
+# 작업량이 이 값의 2배가 안 되면 프로세스 풀을 띄우지 않고 현재 프로세스에서 계산합니다.
+PARALLEL_WORK_PER_WORKER = 25_000_000
+
+
+# --- 전략: 종가로부터 '해당 봉 종가 기준 보유 여부(0/1)' 신호를 만듭니다 ---
+
+def buy_and_hold_signal(close: pd.Series) -> pd.Series:
+    """처음부터 끝까지 보유"""
+    return pd.Series(1.0, index=close.index)
+
+
+def ma_crossover_signal(close: pd.Series, fast: int = 20, slow: int = 60) -> pd.Series:
+    """단기 이동평균이 장기 이동평균보다 위에 있는 동안 보유"""
+    return (sma(close, fast) > sma(close, slow)).astype(float)
+
+
+def rsi_threshold_signal(close: pd.Series, period: int = 14, lower: float = 30, upper: float = 70) -> pd.Series:
+    """RSI가 `lower` 아래로 내려가면 매수하고, `upper` 위로 올라가면 매도할 때까지 보유"""
+    value = rsi(close, period)
+    signal = pd.Series(np.where(value < lower, 1.0, np.where(value > upper, 0.0, np.nan)), index=close.index)
+    # 매수/매도 조건 사이 구간은 직전 상태를 유지합니다.
+    return signal.ffill().fillna(0.0)
+
+
+# 전략 이름 -> (신호 함수, 기본 파라미터, 화면 표시 이름)
+STRATEGIES = {
+    "buy_and_hold": (buy_and_hold_signal, {}, "매수 후 보유"),
+    "ma_crossover": (ma_crossover_signal, {"fast": 20, "slow": 60}, "이동평균 교차"),
+    "rsi_threshold": (rsi_threshold_signal, {"period": 14, "lower": 30, "upper": 70}, "RSI 과매도/과매수"),
+}
+
+
+# --- 시뮬레이션 ---
+
+def simulate(close: np.ndarray, signal: np.ndarray, fee: float = DEFAULT_FEE) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    신호로 일별 전략 수익률과 자산 곡선(시작 = 1.0)을 계산합니다.
+    t일 종가에 나온 신호로 t+1일 수익률부터 보유하므로 미래 정보를 사용하지 않으며,
+    보유 비중이 바뀐 만큼 거래 비용을 차감합니다.
+    반환값: (자산 곡선, 일별 전략 수익률, 일별 보유 비중)
+    """
+    returns = np.zeros_like(close)
+    returns[1:] = close[1:] / close[:-1] - 1
+    position = np.zeros_like(close)
+    position[1:] = signal[:-1]
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    strategy_returns = position * returns - turnover * fee
+    return np.cumprod(1 + strategy_returns), strategy_returns, position
+
+
+def performance(equity: np.ndarray, strategy_returns: np.ndarray, position: np.ndarray,
+                risk_free: float = 0.0) -> dict:
+    """자산 곡선의 총수익률, CAGR, 샤프 지수, 최대 낙폭, 보유 비율, 매수 횟수를 계산합니다."""
+    years = len(equity) / TRADING_DAYS
+    excess = strategy_returns[1:] - risk_free / TRADING_DAYS
+    std = excess.std()
+    return {
+        "total_return": float(equity[-1] - 1),
+        "cagr": float(equity[-1] ** (1 / years) - 1) if years > 0 and equity[-1] > 0 else float("nan"),
+        "sharpe": float(excess.mean() / std * np.sqrt(TRADING_DAYS)) if std > 0 else float("nan"),
+        "max_drawdown": float((equity / np.maximum.accumulate(equity) - 1).min()),
+        "exposure": float(position.mean()),
+        "trades": int((np.diff(position, prepend=0.0) > 0).sum()),
+    }
+
+
+class BacktestResult:
+    """백테스트 1회의 결과 (자산 곡선, 보유 비중, 성과 지표)"""
+
+    def __init__(self, strategy: str, params: dict, equity: pd.Series, position: pd.Series, metrics: dict):
+        self.strategy = strategy
+        self.params = params
+        self.equity = equity
+        self.position = position
+        self.metrics = metrics
+
+    @property
+    def label(self) -> str:
+        params = ", ".join(f"{k}={v}" for k, v in self.params.items())
+        name = STRATEGIES[self.strategy][2]
+        return f"{name} ({params})" if params else name
+
+    def summary(self) -> dict:
+        """AI 프롬프트/화면 표시용 요약"""
+        m = self.metrics
+        return {
+            "전략": self.label,
+            "총수익률(%)": round(m["total_return"] * 100, 2),
+            "CAGR(%)": round(m["cagr"] * 100, 2),
+            "샤프 지수": round(m["sharpe"], 2),
+            "최대 낙폭(%)": round(m["max_drawdown"] * 100, 2),
+            "보유 비율(%)": round(m["exposure"] * 100, 1),
+            "매수 횟수": m["trades"],
+        }
+
+
+@timed("backtest.run")
+def run_backtest(df: pd.DataFrame, strategy: str = "ma_crossover", fee: float = DEFAULT_FEE,
+                 risk_free: float = 0.0, **params) -> BacktestResult:
+    """
+    주가 DataFrame(종가 `Close` 필수)에 전략을 적용해 백테스트합니다.
+    `params`로 전략 기본 파라미터를 바꿀 수 있습니다. 예) run_backtest(df, "ma_crossover", fast=10, slow=50)
+    """
+    func, defaults, _ = STRATEGIES[strategy]
+    params = {**defaults, **params}
+    close = df["Close"].astype(float)
+    signal = func(close, **params)
+    equity, strategy_returns, position = simulate(close.to_numpy(), signal.to_numpy(), fee)
+    return BacktestResult(
+        strategy,
+        params,
+        pd.Series(equity, index=close.index, name="Equity"),
+        pd.Series(position, index=close.index, name="Position"),
+        performance(equity, strategy_returns, position, risk_free),
+    )
+
+
+# --- 파라미터 탐색 ---
+
+def _evaluate_all(close: pd.Series, tasks: list[tuple[str, dict, float, float]]) -> list[dict]:
+    """조합 목록을 차례로 백테스트합니다. 같은 창 길이의 이동평균/RSI는 조합이 달라도 한 번만 계산합니다."""
+    cache: dict = {}
+    prices = close.to_numpy()
+
+    def indicator(name: str, window: int) -> np.ndarray:
+        if (name, window) not in cache:
+            cache[name, window] = (sma if name == "sma" else rsi)(close, window).to_numpy()
+        return cache[name, window]
+
+    rows = []
+    for strategy, params, fee, risk_free in tasks:
+        if strategy == "ma_crossover":
+            signal = (indicator("sma", params["fast"]) > indicator("sma", params["slow"])).astype(float)
+        elif strategy == "rsi_threshold":
+            value = indicator("rsi", params["period"])
+            signal = np.where(value < params["lower"], 1.0, np.where(value > params["upper"], 0.0, np.nan))
+            signal = pd.Series(signal).ffill().fillna(0.0).to_numpy()
+        else:
+            signal = STRATEGIES[strategy][0](close, **params).to_numpy()
+        equity, strategy_returns, position = simulate(prices, signal, fee)
+        rows.append({**params, **performance(equity, strategy_returns, position, risk_free)})
+    return rows
+
+
+# 작업 프로세스마다 한 번만 전달받는 종가
+_worker_close: pd.Series | None = None
+
+
+def _init_worker(close: pd.Series):
+    global _worker_close
+    _worker_close = close
+
+
+def _evaluate_chunk(tasks: list[tuple[str, dict, float, float]]) -> list[dict]:
+    return _evaluate_all(_worker_close, tasks)
+
+
+def parameter_grid(grid: dict[str, list]) -> list[dict]:
+    """{파라미터: 후보 목록}의 모든 조합을 만듭니다."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+@timed("backtest.sweep")
+def sweep(df: pd.DataFrame, strategy: str, grid: dict[str, list], fee: float = DEFAULT_FEE, risk_free: float = 0.0,
+          sort_by: str = "sharpe", max_workers: int | None = None) -> pd.DataFrame:
+    """
+    파라미터 조합 전체를 백테스트해 조합별 성과 지표 표를 `sort_by` 내림차순으로 반환합니다.
+    작업량(조합 수 × 봉 수)이 충분히 크면 프로세스 풀로 나눠 계산하며, 종가는 작업 프로세스마다 한 번만 전달합니다.
+    이동평균 교차에서 fast >= slow인 조합은 제외합니다.
+    """
+    defaults = STRATEGIES[strategy][1]
+    combos = [{**defaults, **params} for params in parameter_grid(grid)]
+    if strategy == "ma_crossover":
+        combos = [p for p in combos if p["fast"] < p["slow"]]
+    if not combos:
+        return pd.DataFrame()
+    close = df["Close"].astype(float).reset_index(drop=True)
+    tasks = [(strategy, params, fee, risk_free) for params in combos]
+
+    # 작업 프로세스 시작 비용보다 나눠 계산해 얻는 시간이 클 만큼만 작업 프로세스를 띄웁니다.
+    work = len(tasks) * len(close)
+    workers = min(max_workers or os.cpu_count() or 1, work // PARALLEL_WORK_PER_WORKER)
+    if workers < 2:
+        rows = _evaluate_all(close, tasks)
+    else:
+        # 조합 순서(파라미터 정렬 순)대로 잘라 나눠야 한 묶음 안에서 같은 지표를 재사용할 수 있습니다.
+        size = -(-len(tasks) // (workers * 2))
+        chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+        # Streamlit/실시간 시세 스레드가 떠 있는 프로세스를 fork하면 락 상태까지 복제되므로 spawn으로 띄웁니다.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(close,)) as pool:
+            rows = [row for chunk_rows in pool.map(_evaluate_chunk, chunks) for row in chunk_rows]
+
+    result = pd.DataFrame(rows)
+    return result.sort_values(sort_by, ascending=False, na_position="last").reset_index(drop=True)
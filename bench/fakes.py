@@ -0,0 +1,297 @@
+"""
+벤치마크용 외부 서비스 대체 객체입니다.
+yfinance, AlphaVantage(FX), GoogleTranslator, OpenAI 클라이언트를 기록된 응답(fixtures)으로 재생하며,
+서비스별 인위적 지연 시간과 yfinance 서버 측 요청 한도(429 응답)를 설정할 수 있습니다.
+"""
+import asyncio
+import functools
+import json
+import sys
+import threading
+import time
+import types
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from live_feed import SimulatedQuoteFeed
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# 서비스별 기본 지연 시간(초) - 실제 서비스의 대략적인 응답 시간
+DEFAULT_LATENCY = {
+    "yfinance_download": 0.35,
+    "yfinance_info": 0.6,
+    "alphavantage": 0.25,
+    "translator": 0.8,
+    "openai_first_token": 0.6,
+    "openai_per_token": 0.01,
+    "quote_feed": 0.15,
+}
+
+
+class CallCounter:
+    """대체 서비스 호출 횟수를 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+
+    def hit(self, name: str):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+
+class YFRateLimitError(Exception):
+    """yfinance가 요청 한도 초과(HTTP 429) 시 발생시키는 예외를 흉내 냅니다."""
+
+    def __init__(self):
+        super().__init__("Too Many Requests. Rate limited. Try after a while.")
+
+
+class ThrottlingEndpoint:
+    """
+    1초 고정 창마다 `limit`회까지만 허용하고, 넘는 호출에는 429(YFRateLimitError)를 돌려주는 가짜 서버 측 한도입니다.
+    limit이 None이면 제한하지 않습니다.
+    """
+
+    def __init__(self, limit: int | None = None):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._window = 0
+        self._count = 0
+
+    def check(self):
+        if self.limit is None:
+            return
+        with self._lock:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window, self._count = window, 0
+            self._count += 1
+            allowed = self._count <= self.limit
+        if not allowed:
+            raise YFRateLimitError()
+
+
+def load_fixture(name: str):
+    return json.loads((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+@functools.lru_cache(maxsize=64)
+def _recorded_or_synthetic_bars(symbol: str) -> pd.DataFrame:
+    recorded = FIXTURES_DIR / f"prices_{symbol}.csv"
+    if recorded.exists():
+        return pd.read_csv(recorded, index_col="Date", parse_dates=True)
+    index = pd.bdate_range("2000-01-03", pd.Timestamp.today().normalize(), name="Date")
+    rng = np.random.default_rng(zlib.crc32(symbol.encode("utf-8")))
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(index))))
+    spread = np.abs(rng.normal(0, 0.01, len(index)))
+    return pd.DataFrame({
+        "Close": close,
+        "High": close * (1 + spread),
+        "Low": close * (1 - spread),
+        "Open": close * (1 + rng.normal(0, 0.005, len(index))),
+        "Volume": rng.integers(20_000_000, 120_000_000, len(index)),
+    }, index=index)
+
+
+def replay_prices(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """
+    기록된 주가(`prices_<SYMBOL>.csv`)가 있으면 재생하고, 없으면 종목 코드로 시드를 고정한
+    랜덤 워크로 2000년부터 오늘까지의 일봉을 만들어 구간을 잘라 반환합니다.
+    """
+    bars = _recorded_or_synthetic_bars(symbol)
+    window = bars.loc[(bars.index >= pd.Timestamp(start)) & (bars.index < pd.Timestamp(end))].copy()
+    # Ticker.history처럼 거래소 시간대가 붙은 인덱스로 반환합니다.
+    window.index = window.index.tz_localize("America/New_York")
+    return window
+
+
+@functools.lru_cache(maxsize=1)
+def _fx_daily_payload() -> dict:
+    index = pd.bdate_range("2000-01-03", pd.Timestamp.today().normalize())
+    rng = np.random.default_rng(7)
+    closes = 1200 * np.exp(np.cumsum(rng.normal(0, 0.004, len(index))))
+    return {"Time Series FX (Daily)": {f"{day:%Y-%m-%d}": {"4. close": f"{close:.4f}"} for day, close in zip(index, closes)}}
+
+
+class FakeQuoteFeed(SimulatedQuoteFeed):
+    """
+    live_feed.SimulatedQuoteFeed에 가짜 서비스의 호출 기록/지연 시간을 더한 장중 시세 피드입니다.
+    시작 가격은 재생 일봉의 마지막 종가입니다.
+    """
+
+    def __init__(self, services: "FakeServices | None" = None, bars_per_poll: int = 1, start: str | None = None):
+        super().__init__(bars_per_poll=bars_per_poll, start=start)
+        self.services = services
+
+    def initial_price(self, symbol: str) -> float:
+        return float(_recorded_or_synthetic_bars(symbol)["Close"].iloc[-1])
+
+    async def fetch_bars(self, symbol: str, since: pd.Timestamp | None = None) -> pd.DataFrame:
+        if self.services is not None:
+            self.services.calls.hit("quote_feed")
+            await asyncio.sleep(self.services.latency.get("quote_feed", 0) * self.services.latency_scale)
+        return await super().fetch_bars(symbol, since)
+
+
+class FakeServices:
+    """
+    대체 서비스 묶음입니다. `install()`은 sys.modules에 가짜 yfinance/deep_translator 모듈을 등록하므로,
+    앱 코드의 지연 임포트(lazy_import)가 그대로 이 객체들을 사용합니다.
+    """
+
+    def __init__(self, latency: dict | None = None, latency_scale: float = 1.0, yahoo_limit: int | None = None):
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.latency_scale = latency_scale
+        self.calls = CallCounter()
+        # yfinance 서버 측 초당 허용 호출 수 (None이면 제한 없음)
+        self.yahoo_endpoint = ThrottlingEndpoint(yahoo_limit)
+        self._saved_modules: dict[str, types.ModuleType | None] = {}
+
+    def sleep(self, name: str):
+        self.calls.hit(name)
+        delay = self.latency.get(name, 0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+    def yahoo_request(self, name: str):
+        """yfinance 호출 1회를 흉내 냅니다. 서버 측 한도를 넘으면 YFRateLimitError를 발생시킵니다."""
+        self.sleep(name)
+        try:
+            self.yahoo_endpoint.check()
+        except YFRateLimitError:
+            self.calls.hit("yfinance_429")
+            raise
+
+    # --- yfinance ---
+
+    def yfinance_module(self) -> types.ModuleType:
+        services = self
+        info_fixture = load_fixture("info_AAPL.json")
+
+        class Ticker:
+            def __init__(self, symbol):
+                self.symbol = symbol
+
+            def history(self, start=None, end=None, auto_adjust=True, **kwargs):
+                # 실제 Ticker.history처럼 요청 한도 초과 시 YFRateLimitError를 그대로 올립니다.
+                services.yahoo_request("yfinance_download")
+                return replay_prices(self.symbol, start, end)
+
+            @property
+            def info(self):
+                services.yahoo_request("yfinance_info")
+                path = FIXTURES_DIR / f"info_{self.symbol}.json"
+                info = json.loads(path.read_text(encoding="utf-8")) if path.exists() else dict(info_fixture)
+                info["symbol"] = self.symbol
+                return info
+
+        module = types.ModuleType("yfinance")
+        module.Ticker = Ticker
+        module.config = SimpleNamespace(network=SimpleNamespace(hide_exceptions=None))
+        return module
+
+    # --- deep_translator ---
+
+    def deep_translator_module(self) -> types.ModuleType:
+        services = self
+
+        class GoogleTranslator:
+            def __init__(self, source="auto", target="ko"):
+                self.target = target
+
+            def translate(self, text):
+                services.sleep("translator")
+                return f"[{self.target}] {text}"
+
+        module = types.ModuleType("deep_translator")
+        module.GoogleTranslator = GoogleTranslator
+        return module
+
+    # --- AlphaVantage ---
+
+    def alphavantage_session(self):
+        services = self
+        rate_fixture = load_fixture("fx_rate.json")
+
+        class Response:
+            def __init__(self, payload):
+                self._payload = payload
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return self._payload
+
+        class Session:
+            def get(self, url, params=None, timeout=None):
+                services.sleep("alphavantage")
+                if params and params.get("function") == "FX_DAILY":
+                    return Response(_fx_daily_payload())
+                return Response(rate_fixture)
+
+        return Session()
+
+    # --- OpenAI ---
+
+    def openai_client(self):
+        services = self
+        answer = load_fixture("openai_answer.json")["content"]
+
+        class Completions:
+            def create(self, model=None, messages=None, temperature=None, max_tokens=None, stream=False):
+                services.sleep("openai_first_token")
+                tokens = answer.split(" ")
+                per_token = services.latency["openai_per_token"] * services.latency_scale
+                if not stream:
+                    time.sleep(per_token * len(tokens))
+                    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+                def chunks():
+                    for i, token in enumerate(tokens):
+                        if i:
+                            time.sleep(per_token)
+                        delta = SimpleNamespace(content=token if i == 0 else " " + token)
+                        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+                return chunks()
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+
+    # --- 장중 시세 ---
+
+    def quote_feed(self, **options) -> FakeQuoteFeed:
+        return FakeQuoteFeed(self, **options)
+
+    # --- 등록/해제 ---
+
+    def install(self):
+        """가짜 yfinance/deep_translator 모듈을 sys.modules에 등록합니다."""
+        for name, module in (("yfinance", self.yfinance_module()), ("deep_translator", self.deep_translator_module())):
+            self._saved_modules.setdefault(name, sys.modules.get(name))
+            sys.modules[name] = module
+        return self
+
+    def uninstall(self):
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._saved_modules.clear()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
@@ -0,0 +1,48 @@
+"""
+실제 서비스에서 응답을 받아 벤치마크용 fixtures로 저장합니다. (네트워크/API 키 필요)
+
+예) python -m bench.record_fixtures AAPL MSFT --years 20
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+from bench.fakes import FIXTURES_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 fixtures 기록")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--years", type=int, default=20, help="기록할 주가 기간(년)")
+    args = parser.parse_args()
+
+    import requests
+    import yfinance as yf
+
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    end = datetime.today()
+    start = end - timedelta(days=365 * args.years)
+    for symbol in (s.upper() for s in args.symbols):
+        info = yf.Ticker(symbol).info
+        (FIXTURES_DIR / f"info_{symbol}.json").write_text(json.dumps(info, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        bars = yf.download(symbol, start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"), progress=False)
+        bars.columns = [col[0] if isinstance(col, tuple) else col for col in bars.columns]
+        bars.index.name = "Date"
+        bars.to_csv(FIXTURES_DIR / f"prices_{symbol}.csv")
+        print(f"{symbol}: 기업 정보 및 주가 {len(bars)}건 기록")
+
+    response = requests.get(
+        "https://www.alphavantage.co/query",
+        params={"function": "CURRENCY_EXCHANGE_RATE", "from_currency": "USD", "to_currency": "KRW",
+                "apikey": os.getenv("ALPHA_API_KEY")},
+        timeout=5,
+    )
+    response.raise_for_status()
+    (FIXTURES_DIR / "fx_rate.json").write_text(json.dumps(response.json(), ensure_ascii=False, indent=2), encoding="utf-8")
+    print("환율 기록 완료")
+
+
+if __name__ == "__main__":
+    main()
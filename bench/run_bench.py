@@ -0,0 +1,310 @@
+"""
+app.py의 각 사용자 동작을 외부 서비스 없이(기록된 응답 재생) 끝까지 실행해 지연 시간과 메모리 할당을 측정합니다.
+
+예)
+    python -m bench.run_bench                         # 기본 지연 시간으로 전체 측정
+    python -m bench.run_bench --latency-scale 0       # 외부 지연 없이 로컬 처리 비용만 측정
+    python -m bench.run_bench --json out.json         # 결과 저장
+    python -m bench.run_bench --baseline out.json     # 기준 결과 대비 p95가 느려지면 종료 코드 1
+    python -m bench.run_bench --only rush --yahoo-limit 3   # 초당 3회 초과 시 429를 돌려주는 yfinance로 동시 접속 측정
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 앱 모듈이 임포트되기 전에 캐시 디렉터리를 임시 경로로 지정합니다.
+_BENCH_DIR = tempfile.mkdtemp(prefix="stock-bench-")
+os.environ["STOCK_CACHE_DIR"] = _BENCH_DIR
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fx_service # noqa: E402
+import gateway # noqa: E402
+import translation_cache # noqa: E402
+import views # noqa: E402
+from bench.fakes import FakeServices # noqa: E402
+from backtest import STRATEGIES # noqa: E402
+from cache_backend import MemoryLRUCache # noqa: E402
+from data_manager import YahooFinanceDataManager # noqa: E402
+from indicators import IndicatorEngine # noqa: E402
+from llm_service import OpenAIService, ResponseCache # noqa: E402
+from prefetch import DEFAULT_PRICE_DAYS, Prefetcher # noqa: E402
+from price_store import PriceStore # noqa: E402
+from utils import get_today_usd_to_krw_rate # noqa: E402
+
+# 주가 조회 구간 (1주 ~ 20년)
+PRICE_RANGES = {"1w": 7, "1m": 30, "1y": 365, "5y": 365 * 5, "20y": 365 * 20}
+
+SYMBOL = "AAPL"
+
+# 장 시작 직후 동시 접속 시나리오: 세션 수와 세션들이 나눠 조회하는 종목
+RUSH_SESSIONS = 24
+RUSH_SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA"]
+
+
+class BenchContext:
+    """
+    측정 1회에 사용할 앱 구성 요소입니다.
+    cold 모드에서는 매 반복마다 새 캐시/저장소로 만들어 모든 외부 호출을 거치게 합니다.
+    """
+
+    def __init__(self, services: FakeServices, run_dir: str):
+        self.services = services
+        self.data_manager = YahooFinanceDataManager(
+            price_store=PriceStore(root=run_dir),
+            cache=MemoryLRUCache(default_ttl=3600),
+        )
+        self.ai_service = OpenAIService(client=services.openai_client(), cache=ResponseCache())
+        self.prefetcher = Prefetcher(self.data_manager)
+        # 전역 환율/번역 서비스도 이 실행 전용으로 교체합니다.
+        fx_service._default_service = fx_service.FXRateService(cache_dir=run_dir, session=services.alphavantage_session())
+        translation_cache._default_translator = translation_cache.CachedTranslator(
+            cache=translation_cache.TranslationCache(path=os.path.join(run_dir, "translations.sqlite3"))
+        )
+
+
+# --- 사용자 동작 (app.py의 버튼 핸들러와 같은 views 함수를 같은 순서로 호출) ---
+
+def _info_and_rate(ctx: BenchContext) -> tuple[dict | None, float | None]:
+    """app.py처럼 종목 스냅샷에서 기업 정보와 환율을 받습니다."""
+    snapshot = ctx.prefetcher.prefetch(SYMBOL)
+    return snapshot.get("info"), snapshot.get("fx_rate")
+
+
+def action_info(ctx: BenchContext, **_):
+    snapshot = ctx.prefetcher.prefetch(SYMBOL)
+    info = snapshot.get("info")
+    # 요청 한도 초과 등으로 조회에 실패하면 app.py처럼 오류 표시만 하고 끝납니다.
+    if info:
+        views.company_overview(SYMBOL, info, snapshot.get("summary_ko"))
+
+
+def action_financials(ctx: BenchContext, **_):
+    info, rate = _info_and_rate(ctx)
+    if info:
+        views.financial_summary(info, rate)
+        views.market_summary(info, rate)
+
+
+def action_officers(ctx: BenchContext, **_):
+    info, rate = _info_and_rate(ctx)
+    views.top_officers(info, rate)
+
+
+def action_metrics(ctx: BenchContext, **_):
+    info, _ = _info_and_rate(ctx)
+    if info:
+        views.investment_metrics(info)
+        views.analyst_opinion(info)
+
+
+def _price_window(days: int) -> tuple[str, str]:
+    end = datetime.today()
+    return (end - timedelta(days=days)).strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+
+def _load_prices(ctx: BenchContext, days: int):
+    start, end = _price_window(days)
+    price_df, _ = views.load_price_history(ctx.data_manager, SYMBOL, start, end, ctx.prefetcher.prefetch(SYMBOL))
+    return start, end, price_df
+
+
+def action_price_history(ctx: BenchContext, days: int, **_):
+    _, _, price_df = _load_prices(ctx, days)
+    if price_df is None:
+        return
+    engine = IndicatorEngine(price_df)
+    fig = views.price_chart(price_df, engine, ["SMA 20", "볼린저 밴드"])
+    fig.to_plotly_json() # 브라우저로 보낼 페이로드 직렬화까지 포함
+
+
+def action_ai_qa(ctx: BenchContext, days: int, **_):
+    start, end, price_df = _load_prices(ctx, days)
+    if price_df is None:
+        return
+    question = "이 종목의 최근 변동성은? 매수 적기일까?"
+    "".join(views.stream_ai_answer(ctx.ai_service, SYMBOL, start, end, price_df, question,
+                                   indicators=IndicatorEngine(price_df)))
+
+
+def action_click_through(ctx: BenchContext, **_):
+    """종목 입력 직후 회사 정보 → 재무 요약 → 임원 → 투자 지표 → 기본 구간 주가 순으로 모두 눌러 보는 경우 (스냅샷 사용)"""
+    action_info(ctx)
+    action_financials(ctx)
+    action_officers(ctx)
+    action_metrics(ctx)
+    _load_prices(ctx, DEFAULT_PRICE_DAYS)
+
+
+def action_click_through_serial(ctx: BenchContext, **_):
+    """같은 순서를 스냅샷 없이 버튼마다 순서대로 조회하는 경우 (비교용, 미리 조회 도입 전 app.py의 동작)"""
+    info = ctx.data_manager.get_info(SYMBOL)
+    if info:
+        views.company_overview(SYMBOL, info)
+        views.financial_summary(info, get_today_usd_to_krw_rate())
+        views.top_officers(info, get_today_usd_to_krw_rate())
+        views.investment_metrics(info)
+    start, end = _price_window(DEFAULT_PRICE_DAYS)
+    views.load_price_history(ctx.data_manager, SYMBOL, start, end)
+
+
+def action_backtest(ctx: BenchContext, days: int, **_):
+    _, _, price_df = _load_prices(ctx, days)
+    if price_df is None:
+        return
+    views.backtest_report(views.run_strategies(price_df, STRATEGIES))
+    views.ma_sweep(price_df)
+
+
+def action_rush(ctx: BenchContext, **_):
+    """여러 세션이 공유 데이터 관리자로 같은 종목들의 기업 정보와 1개월 주가를 동시에 조회합니다."""
+    start, end = _price_window(30)
+
+    def session(i: int):
+        symbol = RUSH_SYMBOLS[i % len(RUSH_SYMBOLS)]
+        ctx.data_manager.get_info(symbol)
+        ctx.data_manager.get_price_data_adjusted(symbol, start, end)
+
+    with ThreadPoolExecutor(max_workers=RUSH_SESSIONS) as pool:
+        list(pool.map(session, range(RUSH_SESSIONS)))
+
+
+ACTIONS = {
+    "info": (action_info, None),
+    "financials": (action_financials, None),
+    "officers": (action_officers, None),
+    "metrics": (action_metrics, None),
+    "price_history": (action_price_history, PRICE_RANGES),
+    "ai_qa": (action_ai_qa, PRICE_RANGES),
+    "click_through": (action_click_through, None),
+    "click_through_serial": (action_click_through_serial, None),
+    "backtest": (action_backtest, {size: PRICE_RANGES[size] for size in ("1y", "5y", "20y")}),
+    "rush": (action_rush, None),
+}
+
+
+# --- 측정 ---
+
+def _percentile(values: list[float], q: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def measure(name: str, func, services: FakeServices, iterations: int, warm: bool, **kwargs) -> dict:
+    """
+    동작 하나를 `iterations`회 실행해 지연 시간 p50/p95와 외부 호출 수를 구하고,
+    별도 1회 실행을 tracemalloc으로 추적해 최대 메모리 할당량을 구합니다.
+    """
+    def new_context(i: int) -> BenchContext:
+        return BenchContext(services, tempfile.mkdtemp(prefix=f"{name}-{i}-", dir=_BENCH_DIR))
+
+    ctx = new_context(0)
+    if warm:
+        func(ctx, **kwargs) # 캐시 적재
+        ctx.prefetcher.wait()
+
+    services.calls.reset()
+    timings = []
+    for i in range(iterations):
+        if not warm:
+            ctx = new_context(i + 1)
+        started = time.perf_counter()
+        func(ctx, **kwargs)
+        timings.append(time.perf_counter() - started)
+        # 화면에 쓰이지 않은 미리 조회가 끝나기를 기다려 외부 호출 수가 실행마다 빠짐없이 집계되게 합니다. (측정 시간 제외)
+        ctx.prefetcher.wait()
+    calls = dict(services.calls.counts)
+
+    ctx = ctx if warm else new_context(iterations + 1)
+    tracemalloc.start()
+    func(ctx, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "action": name,
+        "mode": "warm" if warm else "cold",
+        "p50_ms": round(_percentile(timings, 50) * 1000, 2),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 2),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "external_calls_per_run": {k: round(v / iterations, 2) for k, v in sorted(calls.items())},
+    }
+
+
+def run(iterations: int, latency_scale: float, modes: list[str], only: list[str] | None,
+        yahoo_limit: int | None = None) -> list[dict]:
+    results = []
+    if yahoo_limit is None:
+        # 대체 서비스에는 요청 한도가 없으므로 호출 속도 제한을 꺼서, 측정값에 토큰 대기 시간이 섞이지 않게 합니다.
+        gateway.configure_gateway("yfinance", rate=0)
+    else:
+        # 재시도 대기 시간은 대체 서버의 1초 한도 창보다 줄이지 않습니다. (같은 창에서 다시 거절되지 않도록)
+        gateway.configure_gateway("yfinance", base_delay=1.0)
+    with FakeServices(latency_scale=latency_scale, yahoo_limit=yahoo_limit) as services:
+        for action, (func, sizes) in ACTIONS.items():
+            if only and action not in only:
+                continue
+            for mode in modes:
+                for size, days in (sizes or {"-": None}).items():
+                    label = action if size == "-" else f"{action}[{size}]"
+                    result = measure(label, func, services, iterations, mode == "warm", days=days)
+                    results.append(result)
+                    print(
+                        f"{label:<22} {result['mode']:<5} p50 {result['p50_ms']:>9.2f}ms  "
+                        f"p95 {result['p95_ms']:>9.2f}ms  peak {result['peak_alloc_kb']:>9.1f}KB  "
+                        f"calls {result['external_calls_per_run']}"
+                    )
+    return results
+
+
+def compare_with_baseline(results: list[dict], baseline_path: str, tolerance: float) -> list[str]:
+    """기준 결과 대비 p95가 `tolerance` 비율 이상 느려진 항목을 반환합니다."""
+    baseline = {(r["action"], r["mode"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = []
+    for result in results:
+        base = baseline.get((result["action"], result["mode"]))
+        if base and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['action']} ({result['mode']}): p95 {base['p95_ms']}ms → {result['p95_ms']}ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 사용자 동작 벤치마크")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="대체 서비스 지연 시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--mode", choices=["cold", "warm", "both"], default="both")
+    parser.add_argument("--only", nargs="*", choices=list(ACTIONS), help="측정할 동작만 지정")
+    parser.add_argument("--yahoo-limit", type=int, help="대체 yfinance의 초당 허용 호출 수 (넘으면 429 응답)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p95 증가 비율 (기본 20%%)")
+    args = parser.parse_args()
+
+    modes = ["cold", "warm"] if args.mode == "both" else [args.mode]
+    results = run(args.iterations, args.latency_scale, modes, args.only, args.yahoo_limit)
+
+    if args.json:
+        payload = {"created_at": datetime.now().isoformat(timespec="seconds"), "latency_scale": args.latency_scale,
+                   "iterations": args.iterations, "results": results}
+        Path(args.json).write_text(json.dumps(payload, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print("성능 저하 감지:\n" + "\n".join(f"- {r}" for r in regressions))
+            sys.exit(1)
+        print("기준 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import fnmatch
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from instrumentation import metrics
+
+# 캐시에 값이 없음을 나타내는 표식 (None도 값으로 저장할 수 있도록 별도 객체 사용)
+MISSING = object()
+
+
+class CacheStats:
+    """캐시 적중/실패/삭제 횟수를 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def record(self, field: str, n: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class CacheBackend:
+    """
+    캐시 백엔드의 공통 인터페이스입니다.
+    `get`은 값이 없거나 만료되었으면 MISSING을 반환합니다. `ttl`을 생략하면 `default_ttl`을 사용합니다.
+    """
+
+    def __init__(self, default_ttl: float | None = 3600):
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+
+    def _expires_at(self, ttl: float | None) -> float | None:
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float | None = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryLRUCache(CacheBackend):
+    """프로세스 메모리 캐시입니다. `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+
+    def __init__(self, max_entries: int = 512, default_ttl: float | None = 3600):
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float | None, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.record("misses")
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return MISSING
+            self._entries.move_to_end(key)
+            self.stats.record("hits")
+            return value
+
+    def set(self, key: str, value, ttl: float | None = None):
+        with self._lock:
+            self._entries[key] = (self._expires_at(ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.record("evictions")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(CacheBackend):
+    """
+    SQLite 파일에 pickle로 값을 저장하는 캐시입니다. 프로세스가 재시작되어도 유지되며,
+    같은 파일을 여러 프로세스가 함께 사용할 수 있습니다.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 2000, default_ttl: float | None = 3600):
+        super().__init__(default_ttl)
+        self.path = Path(path or Path(os.getenv("STOCK_CACHE_DIR", ".cache")) / "data_cache.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn: # 블록이 끝나면 커밋
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.record("misses")
+                return MISSING
+            blob, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return MISSING
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self.stats.record("hits")
+        return pickle.loads(blob)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, blob, self._expires_at(ttl), time.time()),
+            )
+            evicted = conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if evicted > 0:
+            self.stats.record("evictions", evicted)
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis 서버를 사용하는 공유 캐시입니다. 여러 Streamlit 레플리카와 배치 작업이 같은 캐시를 씁니다.
+    만료는 Redis TTL(EX)로, 용량 초과 시 삭제는 서버의 maxmemory-policy(allkeys-lru 권장)로 처리합니다.
+    """
+
+    def __init__(self, client=None, url: str | None = None, prefix: str = "stock-analysis:", default_ttl: float | None = 3600):
+        super().__init__(default_ttl)
+        if client is None:
+            import redis # 선택 의존성: Redis 백엔드를 쓸 때만 필요
+
+            client = redis.Redis.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        blob = self.client.get(self.prefix + key)
+        if blob is None:
+            self.stats.record("misses")
+            return MISSING
+        self.stats.record("hits")
+        return pickle.loads(blob)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.client.set(self.prefix + key, blob, ex=int(ttl) if ttl else None)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class FakeRedis:
+    """
+    로컬 개발/테스트용 Redis 대체 객체입니다. RedisCache가 사용하는 명령(get/set/delete/scan_iter)만 지원합니다.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[float | None, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ex: int | None = None):
+        with self._lock:
+            self._data[key] = (time.time() + ex if ex else None, value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(k, None) is not None for k in keys)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            keys = list(self._data)
+        return (k for k in keys if fnmatch.fnmatchcase(k, match))
+
+
+def create_cache_backend(kind: str | None = None) -> CacheBackend:
+    """
+    STOCK_CACHE_BACKEND 환경 변수(memory / disk / redis)에 맞는 캐시 백엔드를 생성합니다.
+    기본값은 memory입니다.
+    """
+    kind = (kind or os.getenv("STOCK_CACHE_BACKEND", "memory")).lower()
+    if kind == "disk":
+        return DiskCache()
+    if kind == "redis":
+        return RedisCache()
+    if kind == "memory":
+        return MemoryLRUCache()
+    raise ValueError(f"지원하지 않는 캐시 백엔드입니다: {kind}")
+
+
+def _is_empty_result(value) -> bool:
+    if value is None:
+        return True
+    return isinstance(value, tuple) and all(v is None for v in value)
+
+
+def cached_method(ttl: float | None = None, cache_empty: bool = False):
+    """
+    인스턴스의 `self.cache` 백엔드에 메서드 결과를 캐싱하는 데코레이터입니다.
+    키는 메서드 이름과 (기본값을 채운) 인자로 만들며, 기본적으로 None 결과(조회 실패)는 캐싱하지 않습니다.
+    캐시된 객체는 호출자 간에 공유되므로 반환값을 수정하지 않아야 합니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:] # self 제외
+            raw_key = f"{func.__qualname__}:{arguments!r}"
+            key = f"{func.__qualname__}:{hashlib.sha256(raw_key.encode('utf-8')).hexdigest()}"
+
+            value = self.cache.get(key)
+            if value is not MISSING:
+                metrics.record_cache(func.__name__, "hit")
+                return value
+            metrics.record_cache(func.__name__, "miss")
+            value = func(self, *args, **kwargs)
+            if cache_empty or not _is_empty_result(value):
+                self.cache.set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from import_profiler import lazy_import
+
+# 차트 폭(centered 레이아웃 약 700px) 기준으로 충분한 최대 표시 점 수
+DEFAULT_MAX_POINTS = 1000
+
+# 이 점 수를 넘으면 SVG 대신 WebGL(Scattergl)로 그립니다.
+WEBGL_THRESHOLD = 800
+
+# 이 점 수 이하일 때만 마커를 함께 표시합니다.
+MARKER_THRESHOLD = 200
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    LTTB(Largest-Triangle-Three-Buckets) 다운샘플링으로 남길 점의 인덱스를 반환합니다.
+    첫/마지막 점은 항상 포함되며, 각 구간에서 인접 점과 만드는 삼각형 넓이가 가장 큰 점을 골라
+    고점/저점 같은 시각적 특징을 유지합니다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(float)
+    y = y.astype(float)
+    # 첫/마지막 점을 제외한 나머지를 n_out - 2개 구간으로 나눕니다.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.nanargmax(area)) if not np.all(np.isnan(area)) else lo
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample(df: pd.DataFrame, column: str = "Close", max_points: int = DEFAULT_MAX_POINTS) -> pd.DataFrame:
+    """날짜 인덱스 DataFrame을 `column` 기준 LTTB로 최대 `max_points`개 행만 남깁니다."""
+    if len(df) <= max_points:
+        return df
+    x = df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))
+    y = df[column].ffill().bfill().to_numpy(dtype=float)
+    return df.iloc[lttb_indices(x, y, max_points)]
+
+
+def build_price_figure(price_df: pd.DataFrame, overlays: pd.DataFrame | None = None,
+                       max_points: int = DEFAULT_MAX_POINTS, hover_unit: str = "원"):
+    """
+    종가 차트를 만듭니다. 긴 구간은 화면 해상도에 맞게 다운샘플링하고,
+    점이 많으면 WebGL 트레이스를 사용해 렌더링 시간을 일정하게 유지합니다.
+    `overlays`(보조지표 컬럼)는 종가와 같은 날짜만 남겨 함께 그립니다.
+    """
+    go = lazy_import("plotly.graph_objects")
+    sampled = downsample(price_df, "Close", max_points)
+    n_points = len(sampled)
+    scatter = go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
+
+    fig = go.Figure()
+    fig.add_trace(scatter(
+        x=sampled.index, # 날짜가 인덱스
+        y=sampled["Close"], # float 타입 그대로 사용
+        mode='lines+markers' if n_points <= MARKER_THRESHOLD else 'lines',
+        name="Close",
+        hovertemplate=f"날짜: %{{x}}<br>종가: %{{y:.2f}}{hover_unit}"
+    ))
+
+    if overlays is not None:
+        overlay_sampled = overlays.reindex(sampled.index)
+        for col in overlay_sampled.columns:
+            fig.add_trace(scatter(
+                x=overlay_sampled.index,
+                y=overlay_sampled[col],
+                mode='lines',
+                name=col,
+                line=dict(width=1, dash='dot' if col.startswith("BB") else 'solid'),
+                hovertemplate=f"{col}: %{{y:.2f}}<extra></extra>"
+            ))
+
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="",
+        showlegend=overlays is not None and not overlays.empty,
+        margin=dict(l=20, r=20, t=20, b=40),
+        height=500
+    )
+    return fig
+
+
+def extend_price_figure(fig, new_bars: pd.DataFrame, column: str = "Close"):
+    """
+    이미 그린 차트의 첫 트레이스에 새 봉을 이어 붙입니다. (실시간 모드에서 차트를 처음부터 다시 만들지 않음)
+    새 봉의 첫 시각 이후에 있던 점(진행 중이던 봉)은 새 값으로 교체합니다.
+    """
+    if new_bars is None or new_bars.empty:
+        return fig
+    trace = fig.data[0]
+    x = pd.DatetimeIndex(trace.x) if trace.x is not None else pd.DatetimeIndex([])
+    y = np.asarray(trace.y if trace.y is not None else [], dtype=float)
+    keep = x < new_bars.index[0]
+    with fig.batch_update():
+        trace.x = x[keep].append(new_bars.index)
+        trace.y = np.concatenate([y[keep], new_bars[column].to_numpy(dtype=float)])
+    return fig
+
+
+def build_comparison_figure(returns: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS):
+    """종목별 누적 수익률(%)을 한 차트에 겹쳐 그립니다."""
+    go = lazy_import("plotly.graph_objects")
+    scatter = go.Scattergl if len(returns) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure()
+    for col in returns.columns:
+        series = downsample(returns[[col]].dropna(), col, max_points)[col]
+        fig.add_trace(scatter(
+            x=series.index,
+            y=series,
+            mode='lines',
+            name=col,
+            hovertemplate=f"{col}<br>날짜: %{{x}}<br>수익률: %{{y:.2f}}%"
+        ))
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="누적 수익률 (%)",
+        margin=dict(l=20, r=20, t=20, b=40),
+        height=500
+    )
+    return fig
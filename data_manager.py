@@ -1,71 +1,142 @@
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_backend import CacheBackend, MemoryLRUCache, cached_method
+from gateway import get_gateway
+from import_profiler import lazy_import
+from instrumentation import metrics, timed
+from price_store import PriceStore, flatten_columns
+from trading_calendar import TradingCalendar
+
+# 화면에 표시할 주가 컬럼 순서
+PRICE_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+# 렌더링 시 적용할 숫자 표시 형식 (st.column_config.NumberColumn의 format)
+PRICE_DISPLAY_FORMATS = {
+    "Close": "%.2f",
+    "High": "%.2f",
+    "Low": "%.2f",
+    "Open": "%.2f",
+    "Volume": "%d",
+}
+
+
+def _fetch_info(symbol: str) -> dict | None:
+    yf = lazy_import("yfinance")
+    ticker = yf.Ticker(symbol)
+    with metrics.timer("yfinance.info"):
+        return ticker.info
+
 
 class YahooFinanceDataManager:
-    def __init__(self):
-        pass
+    def __init__(self, price_store: PriceStore | None = None, cache: CacheBackend | None = None):
+        # 이미 받아 둔 주가는 로컬 저장소에서 읽고, 부족한 구간만 새로 내려받습니다.
+        self.price_store = price_store or PriceStore()
+        # 조회 결과 캐시 (메모리/디스크/Redis 백엔드 중 선택, 기본은 1시간 TTL 메모리 LRU)
+        self.cache = cache or MemoryLRUCache(default_ttl=3600)
 
-    @st.cache_data(show_spinner=True, ttl=3600) # 1시간 캐싱
-    def get_price_data_adjusted(_self, symbol: str, start: str, end: str, max_backtrack_days: int = 30): # self를 _self로 변경
+    @timed("get_price_data_adjusted")
+    @cached_method(ttl=3600) # 1시간 캐싱
+    def get_price_data_adjusted(self, symbol: str, start: str, end: str, max_backtrack_days: int = 30):
         """
-        주가 데이터를 조회합니다. 
-        종료일에 데이터가 없으면 이전 날짜로 이동하며 최대 `max_backtrack_days`까지 조회합니다.
+        주가 데이터를 조회합니다.
+        종료일 이전 `max_backtrack_days`일까지 넓힌 구간을 한 번에 받아 두고,
+        거래일 인덱스에서 종료일 이전의 마지막 거래일을 찾아 조정된 종료일로 반환합니다.
+        데이터는 로컬 가격 저장소(PriceStore)를 거쳐 부족한 구간만 내려받습니다.
         """
-        current_end = datetime.strptime(end, "%Y-%m-%d")
-        for i in range(max_backtrack_days):
-            end_str = current_end.strftime("%Y-%m-%d")
-            try:
-                df = yf.download(symbol, start=start, end=end_str, progress=False)
-                if not df.empty:
-                    return df, end_str
-            except Exception as e:
-                print(f"yfinance download error for {symbol} on {end_str}: {e}")
-            current_end -= timedelta(days=1)
-        return None, None
-
-    @st.cache_data(show_spinner=False, ttl=3600) # 1시간 캐싱
-    def get_info(_self, symbol: str) -> dict | None: # self를 _self로 변경
+        end_dt = datetime.strptime(end, "%Y-%m-%d")
+        window_start = min(datetime.strptime(start, "%Y-%m-%d"), end_dt - timedelta(days=max_backtrack_days))
+        try:
+            # 휴장일로 끝나는 구간이어도 직전 거래일을 찾을 수 있도록 한 번에 넓게 받습니다.
+            window = self.price_store.get(symbol, window_start.strftime("%Y-%m-%d"), end)
+        except Exception as e:
+            metrics.count("external_errors_total", service="yfinance")
+            print(f"yfinance download error for {symbol} on {end}: {e}")
+            return None, None
+
+        # 받아 온 봉(저장되지 않는 오늘 봉 포함)의 날짜로 거래일 인덱스를 만들어 종료일 직전 거래일을 찾습니다.
+        last_session = TradingCalendar(window.index).last_session_before(end_dt)
+        df = window.loc[window.index >= pd.Timestamp(start)] if not window.empty else window
+        if last_session is None or df.empty:
+            return None, None
+        # 종료일 직전 거래일까지 거슬러 올라간 일수 (기존 하루 단위 재조회 루프의 반복 횟수에 해당)
+        metrics.count("price_backtrack_days_total", (end_dt - last_session).days - 1)
+        return df, last_session.strftime("%Y-%m-%d")
+
+    @timed("get_info")
+    @cached_method(ttl=3600) # 1시간 캐싱
+    def get_info(self, symbol: str) -> dict | None:
         """
         주어진 종목 코드에 대한 기업 정보를 가져옵니다.
         """
+        return self.fetch_info(symbol)
+
+    def fetch_info(self, symbol: str) -> dict | None:
+        """
+        캐시를 거치지 않고 기업 정보를 가져옵니다.
+        수백 종목을 한 번에 조회하는 스크리너처럼 전체 info를 캐시에 남길 필요가 없는 경우에 사용합니다.
+        """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            # 동시에 들어온 같은 종목 요청은 yfinance 관문에서 한 번의 호출로 합쳐집니다.
+            info = get_gateway("yfinance").call(("info", symbol), _fetch_info, symbol)
             if not info:
                 # yfinance가 빈 dict나 None을 반환하는 경우 방지
                 if not info or not isinstance(info, dict) or not info.get('symbol'):
                   return None
             return info
         except Exception as e:
+            metrics.count("external_errors_total", service="yfinance")
             print(f"기업 정보 가져오기 실패: {e}")
             return None
 
+    def get_price_data_batch(self, symbols: list[str], start: str, end: str, max_workers: int = 8) -> dict[str, pd.DataFrame]:
+        """
+        여러 종목의 주가 데이터를 스레드 풀로 동시에 조회합니다.
+        데이터가 없는 종목은 결과에서 제외됩니다.
+        """
+        symbols = list(dict.fromkeys(symbols)) # 중복 제거 (순서 유지)
+        if not symbols:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            results = pool.map(lambda s: self.get_price_data_adjusted(s, start, end), symbols)
+            return {s: df for s, (df, _) in zip(symbols, results) if df is not None and not df.empty}
+
+    def get_info_batch(self, symbols: list[str], max_workers: int = 8) -> dict[str, dict | None]:
+        """여러 종목의 기업 정보를 스레드 풀로 동시에 조회합니다."""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            return dict(zip(symbols, pool.map(self.get_info, symbols)))
+
+    @staticmethod
+    def normalized_returns(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        종목별 종가를 날짜 기준으로 정렬한 뒤, 첫 거래일 대비 누적 수익률(%)로 변환한
+        와이드(wide) DataFrame을 반환합니다. 컬럼은 종목 코드입니다.
+        """
+        if not frames:
+            return pd.DataFrame()
+        closes = pd.concat({s: df["Close"] for s, df in frames.items()}, axis=1).sort_index()
+        # 휴장일이 다른 종목(예: 한국/미국)은 직전 종가로 채워 정렬합니다.
+        closes = closes.ffill()
+        return (closes / closes.bfill().iloc[0] - 1) * 100
+
+    @timed("process_price_df")
     def process_price_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        다운로드한 주가 데이터를 Streamlit 표시를 위해 포맷팅합니다.
+        다운로드한 주가 데이터를 Streamlit 표시를 위해 정리합니다.
+        숫자 컬럼은 숫자형 그대로 유지하고, 표시 형식은 렌더링 시점에
+        `PRICE_DISPLAY_FORMATS`로 적용합니다. (복사/reset_index 없이 날짜 인덱스 유지)
         """
         if df is None:
             return pd.DataFrame()
-            
-        df = df.reset_index()
+
         # 멀티 인덱스 컬럼 평탄화 처리 (yfinance 최신 버전에서는 필요 없을 수도 있지만 안전하게 유지)
-        df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-        
-        df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
-        
-        # 숫자 컬럼이 존재하는지 확인 후 처리
-        numeric_cols = ["Close", "High", "Low", "Open", "Volume"]
-        for col in numeric_cols:
-            if col in df.columns:
-                if col != "Volume":
-                    df[col] = df[col].map(lambda x: f"{x:.2f}")
-                else:
-                    df[col] = df[col].map(lambda x: f"{int(x):,}")
-        
+        flatten_columns(df)
+
         # 필요한 컬럼만 선택하고 순서를 유지합니다.
         # 존재하지 않는 컬럼을 방어적으로 제외하여 오류를 방지합니다.
-        final_cols = ["Date", "Close", "High", "Low", "Open", "Volume"]
-        cols = [c for c in final_cols if c in df.columns]
-        return df[cols]
\ No newline at end of file
+        cols = [c for c in PRICE_COLUMNS if c in df.columns]
+        return df if list(df.columns) == cols else df[cols]
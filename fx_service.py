@@ -0,0 +1,206 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from import_profiler import lazy_import
+from instrumentation import metrics, timed
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+
+# 한 번도 환율 조회에 성공하지 못했을 때만 사용하는 기본 환율
+DEFAULT_USD_KRW_RATE = 1350.0
+
+# 조회에 실패한 뒤 다시 시도하기까지 기다리는 최대 시간(초). 실제 대기 시간은 min(ttl, 이 값)입니다.
+FAILURE_BACKOFF = 60
+
+
+class FXRateService:
+    """
+    USD/KRW 환율 조회 서비스입니다. 프로세스 전체(모든 Streamlit 세션)가 하나의 캐시를 공유합니다.
+
+    - TTL이 지나지 않은 환율은 네트워크 호출 없이 바로 반환합니다.
+    - TTL이 지난 환율은 일단 그대로 반환하고, 백그라운드에서 한 번만 갱신합니다. (stale-while-revalidate)
+    - 동시에 여러 요청이 들어와도 실제 API 호출은 하나만 수행합니다. (single-flight)
+    - 조회에 실패하면 min(ttl, 60초) 동안은 다시 호출하지 않고 마지막 환율(없으면 기본 환율)을 반환합니다.
+    - 마지막으로 성공한 환율은 디스크에 저장해 재시작 후에도 대체값으로 사용합니다.
+    """
+
+    def __init__(self, ttl: float = 600, history_ttl: float = 86400, cache_dir: str | None = None, session=None):
+        self.ttl = ttl
+        self.history_ttl = history_ttl
+        self._session = session
+        self._lock = threading.Lock()
+        self._inflight: threading.Event | None = None
+        self._rate: float | None = None
+        self._fetched_at = float("-inf")
+        self._failed_at: float | None = None
+        self._history_lock = threading.Lock()
+        self._history: pd.Series | None = None
+        self._history_fetched_at = float("-inf")
+        self._history_failed_at: float | None = None
+
+        self._state_path = Path(cache_dir or os.getenv("STOCK_CACHE_DIR", ".cache")) / "fx_usd_krw.json"
+        self._load_state()
+
+    @property
+    def _http(self):
+        # requests는 실제 API 호출 시에만 로드합니다.
+        return self._session or lazy_import("requests")
+
+    def _backing_off(self, failed_at: float | None, ttl: float) -> bool:
+        """마지막 실패 후 아직 재시도 대기 시간(min(ttl, FAILURE_BACKOFF))이 지나지 않았는지 확인합니다."""
+        return failed_at is not None and time.monotonic() - failed_at < min(ttl, FAILURE_BACKOFF)
+
+    # --- 마지막 성공 환율 저장/복원 ---
+
+    def _load_state(self):
+        try:
+            state = json.loads(self._state_path.read_text())
+            # 디스크에서 읽은 값은 만료된 값(stale)으로 취급해 첫 조회 때 갱신합니다.
+            self._rate = float(state["rate"])
+        except Exception:
+            pass
+
+    def _save_state(self, rate: float):
+        try:
+            self._state_path.parent.mkdir(parents=True, exist_ok=True)
+            self._state_path.write_text(json.dumps({"rate": rate, "fetched_at": time.time()}))
+        except OSError as e:
+            print(f"환율 캐시 저장 실패: {e}")
+
+    # --- 실시간 환율 ---
+
+    @timed("alphavantage.rate")
+    def _fetch_rate(self) -> float:
+        params = {
+            "function": "CURRENCY_EXCHANGE_RATE",
+            "from_currency": "USD",
+            "to_currency": "KRW",
+            "apikey": os.getenv("ALPHA_API_KEY"),
+        }
+        response = self._http.get(ALPHA_VANTAGE_URL, params=params, timeout=5)
+        response.raise_for_status()
+        data = response.json()
+        return float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
+
+    def _refresh(self, done: threading.Event):
+        try:
+            rate = self._fetch_rate()
+            with self._lock:
+                self._rate = rate
+                self._fetched_at = time.monotonic()
+                self._failed_at = None
+            self._save_state(rate)
+        except Exception as e:
+            with self._lock:
+                self._failed_at = time.monotonic()
+            metrics.count("external_errors_total", service="alphavantage")
+            print(f"AlphaVantage 환율 정보를 가져오는 데 실패했습니다: {e}")
+        finally:
+            with self._lock:
+                self._inflight = None
+            done.set()
+
+    def get_usd_krw_rate(self) -> float:
+        """현재 USD/KRW 환율을 반환합니다."""
+        with self._lock:
+            if self._rate is not None and time.monotonic() - self._fetched_at < self.ttl:
+                metrics.record_cache("fx_rate", "hit")
+                return self._rate
+            metrics.record_cache("fx_rate", "stale" if self._rate is not None else "miss")
+
+            if self._inflight is None and self._backing_off(self._failed_at, self.ttl):
+                # 직전 조회가 실패했으므로 대기 시간이 지날 때까지 다시 호출하지 않습니다.
+                return self._rate if self._rate is not None else DEFAULT_USD_KRW_RATE
+
+            leader = self._inflight is None
+            if leader:
+                self._inflight = threading.Event()
+            done = self._inflight
+
+            if self._rate is not None:
+                # 만료된 값이라도 즉시 반환하고, 갱신은 백그라운드에서 한 번만 수행합니다.
+                if leader:
+                    threading.Thread(target=self._refresh, args=(done,), daemon=True).start()
+                return self._rate
+
+        # 캐시가 전혀 없는 경우에만 갱신을 기다립니다.
+        if leader:
+            self._refresh(done)
+        else:
+            done.wait(timeout=10)
+        return self._rate if self._rate is not None else DEFAULT_USD_KRW_RATE
+
+    # --- 과거 일별 환율 ---
+
+    @timed("alphavantage.history")
+    def _fetch_history(self) -> pd.Series:
+        params = {
+            "function": "FX_DAILY",
+            "from_symbol": "USD",
+            "to_symbol": "KRW",
+            "outputsize": "full",
+            "apikey": os.getenv("ALPHA_API_KEY"),
+        }
+        response = self._http.get(ALPHA_VANTAGE_URL, params=params, timeout=10)
+        response.raise_for_status()
+        series = response.json()["Time Series FX (Daily)"]
+        history = pd.Series(
+            {pd.Timestamp(day): float(values["4. close"]) for day, values in series.items()},
+            name="USDKRW",
+        ).sort_index()
+        history.index.name = "Date"
+        return history
+
+    def get_usd_krw_history(self) -> pd.Series | None:
+        """일별 USD/KRW 종가 시계열을 반환합니다. 조회에 실패하면 마지막으로 받은 값 또는 None을 반환합니다."""
+        if self._history is not None and time.monotonic() - self._history_fetched_at < self.history_ttl:
+            return self._history
+        # 락을 잡은 요청 하나만 조회하고, 나머지는 끝난 뒤 캐시된 결과를 사용합니다.
+        with self._history_lock:
+            if self._history is not None and time.monotonic() - self._history_fetched_at < self.history_ttl:
+                return self._history
+            if self._backing_off(self._history_failed_at, self.history_ttl):
+                return self._history
+            try:
+                self._history = self._fetch_history()
+                self._history_fetched_at = time.monotonic()
+                self._history_failed_at = None
+            except Exception as e:
+                self._history_failed_at = time.monotonic()
+                metrics.count("external_errors_total", service="alphavantage")
+                print(f"AlphaVantage 과거 환율 정보를 가져오는 데 실패했습니다: {e}")
+            return self._history
+
+    def convert_to_krw(self, df: pd.DataFrame, columns=("Open", "High", "Low", "Close")) -> pd.DataFrame:
+        """
+        날짜 인덱스를 가진 USD 가격 데이터를 일별 환율로 원화 환산합니다.
+        환율이 없는 날(주말/휴일)은 직전 환율을 사용하며, 과거 환율을 받지 못하면 현재 환율로 환산합니다.
+        """
+        cols = [c for c in columns if c in df.columns]
+        converted = df.copy()
+        history = self.get_usd_krw_history()
+        if history is None or history.empty:
+            rates = self.get_usd_krw_rate()
+        else:
+            rates = history.reindex(history.index.union(df.index)).ffill().bfill().reindex(df.index)
+        converted[cols] = df[cols].mul(rates, axis=0)
+        return converted
+
+
+_default_service: FXRateService | None = None
+_default_service_lock = threading.Lock()
+
+
+def get_fx_service() -> FXRateService:
+    """프로세스 전역에서 공유하는 FXRateService 인스턴스를 반환합니다."""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                _default_service = FXRateService()
+    return _default_service
@@ -0,0 +1,164 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from instrumentation import metrics
+
+# 외부 서비스별 기본 호출 한도 (초당 요청 수, 순간 허용량). 0 이하이면 제한하지 않습니다.
+DEFAULT_RATE = float(os.getenv("YAHOO_RATE_LIMIT", "4"))
+DEFAULT_BURST = int(os.getenv("YAHOO_RATE_BURST", "8"))
+
+
+class ThrottledError(Exception):
+    """외부 서비스가 요청 한도 초과(HTTP 429)를 알렸을 때 발생합니다."""
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    """요청 한도 초과로 인한 오류인지 판단합니다. (429 상태 코드, yfinance의 YFRateLimitError 등)"""
+    if isinstance(exc, ThrottledError) or type(exc).__name__ == "YFRateLimitError":
+        return True
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status == 429:
+        return True
+    text = str(exc)
+    return "Too Many Requests" in text or "Rate limited" in text or " 429" in text
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 호출 속도 제한기입니다.
+    초당 `rate`개씩 토큰이 채워지고 최대 `capacity`개까지 쌓이며, 호출 1회에 토큰 1개를 사용합니다.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        # 서비스가 요청 한도 초과를 알린 뒤 모든 호출을 멈추는 시점
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float):
+        """`seconds`초 동안 모든 호출자의 토큰 발급을 멈춥니다."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def acquire(self) -> float:
+        """토큰 1개를 받을 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        with self._lock:
+            now = self._clock()
+            if self.rate > 0:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # 토큰을 미리 예약(음수 허용)해 두고 락 밖에서 기다리므로, 대기 순서대로 발급됩니다.
+                self._tokens -= 1
+                wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            else:
+                wait = 0.0
+            wait = max(wait, self._paused_until - now)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class SingleFlight:
+    """
+    같은 키의 요청이 이미 진행 중이면 새로 호출하지 않고 진행 중인 호출의 결과를 함께 받습니다.
+    (결과를 저장하지는 않으므로, 호출이 끝난 뒤의 같은 요청은 다시 실행됩니다)
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[object, Future] = {}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            metrics.count("coalesced_requests_total", service=self.name)
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class OutboundGateway:
+    """
+    외부 서비스 호출 관문입니다. 프로세스 전체(모든 Streamlit 세션)가 서비스별로 하나를 공유합니다.
+
+    - 같은 요청이 동시에 들어오면 실제 호출은 한 번만 수행합니다. (single-flight)
+    - 토큰 버킷으로 초당 호출 수를 제한합니다.
+    - 요청 한도 초과 오류는 지수 백오프 + 지터로 재시도하며, 그동안 다른 호출도 함께 멈춥니다.
+    """
+
+    def __init__(self, name: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 30.0, sleep=time.sleep):
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self._flight = SingleFlight(name)
+
+    def call(self, key, func, *args, **kwargs):
+        """`func(*args, **kwargs)`를 호출합니다. `key`가 같은 진행 중 요청과는 결과를 공유합니다."""
+        return self._flight.do(key, self._call_with_retry, func, args, kwargs)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """`attempt`번째 재시도 전 대기 시간 (full jitter: 0 ~ base * 2^attempt 사이 무작위)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _call_with_retry(self, func, args, kwargs):
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            if waited > 0:
+                metrics.observe(f"{self.name}.rate_limit_wait", waited)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                metrics.count("retries_total", service=self.name)
+                print(f"{self.name} 요청 한도 초과, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                # 같은 서비스로 가는 다른 요청도 함께 쉬게 해 한도 초과가 이어지지 않도록 합니다.
+                self.bucket.pause(delay)
+
+
+_gateways: dict[str, OutboundGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(name: str) -> OutboundGateway:
+    """프로세스 전역에서 공유하는 서비스별 OutboundGateway 인스턴스를 반환합니다."""
+    gateway = _gateways.get(name)
+    if gateway is None:
+        with _gateways_lock:
+            gateway = _gateways.setdefault(name, OutboundGateway(name))
+    return gateway
+
+
+def configure_gateway(name: str, **options) -> OutboundGateway:
+    """서비스별 관문을 주어진 설정(rate, burst, max_retries 등)으로 새로 만듭니다."""
+    with _gateways_lock:
+        gateway = _gateways[name] = OutboundGateway(name, **options)
+    return gateway
@@ -0,0 +1,63 @@
+import importlib
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+
+# 이 모듈이 처음 임포트된 시점 (프로세스 콜드 스타트 기준점)
+PROCESS_STARTED = time.perf_counter()
+
+_lock = threading.Lock()
+_import_times: dict[str, float] = {}
+_rerun_times: deque[float] = deque(maxlen=200)
+_cold_start: float | None = None
+
+
+def lazy_import(module_name: str):
+    """
+    모듈을 실제로 사용하는 시점에 임포트합니다. 처음 임포트할 때 걸린 시간을 기록합니다.
+    이미 로드된 모듈은 sys.modules에서 바로 반환합니다.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _lock:
+        _import_times.setdefault(module_name, time.perf_counter() - started)
+    return module
+
+
+def record_rerun(started: float):
+    """스크립트 실행 1회(Streamlit rerun)의 소요 시간을 기록합니다. 첫 실행은 콜드 스타트로 따로 보관합니다."""
+    global _cold_start
+    elapsed = time.perf_counter() - started
+    with _lock:
+        if _cold_start is None:
+            # 콜드 스타트는 프로세스 시작(이 모듈 임포트)부터 첫 실행 종료까지로 계산합니다.
+            _cold_start = time.perf_counter() - PROCESS_STARTED
+            print(f"콜드 스타트 {_cold_start * 1000:.0f}ms, 지연 임포트: {format_import_times()}")
+        else:
+            _rerun_times.append(elapsed)
+
+
+def format_import_times() -> str:
+    with _lock:
+        items = sorted(_import_times.items(), key=lambda kv: kv[1], reverse=True)
+    return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in items) or "없음"
+
+
+def import_report() -> dict:
+    """콜드 스타트/재실행 시간과 지연 임포트된 모듈별 임포트 시간을 반환합니다."""
+    with _lock:
+        reruns = list(_rerun_times)
+        imports = dict(sorted(_import_times.items(), key=lambda kv: kv[1], reverse=True))
+        cold_start = _cold_start
+    return {
+        "cold_start_ms": round(cold_start * 1000, 1) if cold_start is not None else None,
+        "rerun_count": len(reruns),
+        "rerun_p50_ms": round(statistics.median(reruns) * 1000, 1) if reruns else None,
+        "rerun_max_ms": round(max(reruns) * 1000, 1) if reruns else None,
+        "lazy_imports_ms": {name: round(seconds * 1000, 1) for name, seconds in imports.items()},
+    }
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# 연환산 시 사용하는 연간 거래일 수
+TRADING_DAYS = 252
+
+
+def _seeded_ewm(values: pd.Series, seed: float | None = None, **ewm_kwargs) -> pd.Series:
+    """
+    adjust=False 지수 이동 평균을 계산합니다.
+    `seed`(직전 시점의 평균값)를 주면 그 값에서 이어서 계산하므로, 뒤에 붙은 봉만 다시 계산할 수 있습니다.
+    """
+    if seed is None or np.isnan(seed):
+        return values.ewm(adjust=False, **ewm_kwargs).mean()
+    seeded = pd.Series(np.concatenate([[seed], values.to_numpy(dtype=float)]))
+    result = seeded.ewm(adjust=False, **ewm_kwargs).mean().to_numpy()[1:]
+    return pd.Series(result, index=values.index)
+
+
+def sma(close: pd.Series, window: int) -> pd.Series:
+    """단순 이동 평균"""
+    return close.rolling(window).mean()
+
+
+def ema(close: pd.Series, span: int, seed: float | None = None) -> pd.Series:
+    """지수 이동 평균"""
+    return _seeded_ewm(close, seed, span=span)
+
+
+def rolling_volatility(close: pd.Series, window: int = 20, annualize: bool = True) -> pd.Series:
+    """일간 수익률의 이동 표준편차 (기본: 연환산)"""
+    vol = close.pct_change().rolling(window).std()
+    return vol * np.sqrt(TRADING_DAYS) if annualize else vol
+
+
+def bollinger_bands(close: pd.Series, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
+    """볼린저 밴드 (중심선 = 이동 평균, 상/하단 = 중심선 ± num_std × 이동 표준편차)"""
+    mid = close.rolling(window).mean()
+    std = close.rolling(window).std()
+    return pd.DataFrame({"BB_Mid": mid, "BB_Upper": mid + num_std * std, "BB_Lower": mid - num_std * std})
+
+
+def rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """Wilder 방식의 RSI"""
+    delta = close.diff()
+    avg_gain = _seeded_ewm(delta.clip(lower=0), alpha=1 / period)
+    avg_loss = _seeded_ewm(-delta.clip(upper=0), alpha=1 / period)
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    """MACD 선, 시그널 선, 히스토그램"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return pd.DataFrame({"MACD": line, "MACD_Signal": signal_line, "MACD_Hist": line - signal_line})
+
+
+def drawdown(close: pd.Series) -> pd.Series:
+    """직전 최고점 대비 하락률"""
+    return close / close.cummax() - 1
+
+
+def max_drawdown(close: pd.Series) -> tuple[float, pd.Timestamp, pd.Timestamp]:
+    """최대 낙폭과 그 고점/저점 날짜를 반환합니다."""
+    dd = drawdown(close)
+    trough = dd.idxmin()
+    peak = close.loc[:trough].idxmax()
+    return float(dd.min()), peak, trough
+
+
+class IndicatorEngine:
+    """
+    주가 DataFrame에 대한 기술 지표를 한 번에 계산하고 보관합니다.
+    `update`로 새 봉을 추가하면 이동 창(window)에 필요한 과거 구간과 지수 평균의 직전 값만 사용해
+    뒤쪽(tail)만 다시 계산합니다.
+    """
+
+    def __init__(self, bars: pd.DataFrame, ma_windows=(20, 60, 120), vol_window: int = 20, rsi_period: int = 14,
+                 macd_params=(12, 26, 9), bb_window: int = 20, bb_std: float = 2.0):
+        self.ma_windows = tuple(ma_windows)
+        self.vol_window = vol_window
+        self.rsi_period = rsi_period
+        self.macd_params = tuple(macd_params)
+        self.bb_window = bb_window
+        self.bb_std = bb_std
+        self.bars = bars.sort_index()
+        self._values = self._compute(self.bars, len(self.bars), None)
+
+    @property
+    def lookback(self) -> int:
+        """이동 창 계산에 필요한 최대 과거 봉 수"""
+        return max(*self.ma_windows, self.vol_window + 1, self.bb_window)
+
+    @property
+    def values(self) -> pd.DataFrame:
+        """계산된 지표 (내부 상태 컬럼 제외)"""
+        return self._values[[c for c in self._values.columns if not c.startswith("_")]]
+
+    def _compute(self, context: pd.DataFrame, n_tail: int, state: pd.Series | None) -> pd.DataFrame:
+        close = context["Close"].astype(float)
+        tail = close.iloc[-n_tail:]
+        out = pd.DataFrame(index=tail.index)
+
+        # 이동 창 지표: 과거 lookback 구간을 포함한 context에서 계산 후 뒤쪽만 사용
+        for window in self.ma_windows:
+            out[f"SMA_{window}"] = sma(close, window).iloc[-n_tail:]
+        out["Volatility"] = rolling_volatility(close, self.vol_window).iloc[-n_tail:]
+        out = out.join(bollinger_bands(close, self.bb_window, self.bb_std).iloc[-n_tail:])
+
+        # 지수 평균 지표: 직전 상태(state)에서 이어서 계산
+        seed = (lambda col: None) if state is None else (lambda col: float(state[col]))
+        fast, slow, signal = self.macd_params
+        out["_EMA_Fast"] = ema(tail, fast, seed("_EMA_Fast"))
+        out["_EMA_Slow"] = ema(tail, slow, seed("_EMA_Slow"))
+        out["MACD"] = out["_EMA_Fast"] - out["_EMA_Slow"]
+        out["MACD_Signal"] = ema(out["MACD"], signal, seed("MACD_Signal"))
+        out["MACD_Hist"] = out["MACD"] - out["MACD_Signal"]
+
+        delta = tail.diff()
+        if state is not None:
+            delta.iloc[0] = tail.iloc[0] - float(state["_Close"])
+        out["_Avg_Gain"] = _seeded_ewm(delta.clip(lower=0), seed("_Avg_Gain"), alpha=1 / self.rsi_period)
+        out["_Avg_Loss"] = _seeded_ewm(-delta.clip(upper=0), seed("_Avg_Loss"), alpha=1 / self.rsi_period)
+        out["RSI"] = 100 - 100 / (1 + out["_Avg_Gain"] / out["_Avg_Loss"])
+
+        prior_peak = -np.inf if state is None else float(state["_Peak"])
+        out["_Peak"] = np.maximum.accumulate(np.maximum(tail.to_numpy(), prior_peak))
+        out["Drawdown"] = tail / out["_Peak"] - 1
+        out["_Close"] = tail
+        return out
+
+    def update(self, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        새 봉을 추가(같은 날짜는 교체)하고 뒤쪽 지표만 다시 계산합니다. 갱신된 지표 전체를 반환합니다.
+        """
+        if new_bars is None or new_bars.empty:
+            return self.values
+        new_bars = new_bars.sort_index()
+        first = new_bars.index[0]
+        kept_bars = self.bars.loc[self.bars.index < first]
+        kept_values = self._values.loc[self._values.index < first]
+
+        self.bars = pd.concat([kept_bars, new_bars])
+        n_tail = len(new_bars)
+        context = self.bars.iloc[-(n_tail + self.lookback):]
+        state = kept_values.iloc[-1] if not kept_values.empty else None
+        if state is None:
+            context = self.bars
+            n_tail = len(self.bars)
+        self._values = pd.concat([kept_values, self._compute(context, n_tail, state)])
+        return self.values
+
+    def summary(self) -> dict:
+        """가장 최근 시점의 지표 요약 (AI 프롬프트용)"""
+        last = self._values.iloc[-1]
+        close = float(last["_Close"])
+        mdd, peak, trough = max_drawdown(self.bars["Close"].astype(float))
+        result = {}
+        for window in self.ma_windows:
+            value = last[f"SMA_{window}"]
+            if not np.isnan(value):
+                result[f"{window}일 이동평균"] = f"{value:.2f} (종가 대비 {(close / value - 1) * 100:+.2f}%)"
+        if not np.isnan(last["Volatility"]):
+            result[f"{self.vol_window}일 변동성(연환산, %)"] = round(float(last["Volatility"]) * 100, 2)
+        if not np.isnan(last["RSI"]):
+            result[f"RSI({self.rsi_period})"] = round(float(last["RSI"]), 2)
+        result["MACD / 시그널"] = f"{last['MACD']:.3f} / {last['MACD_Signal']:.3f}"
+        if not np.isnan(last["BB_Upper"]):
+            result["볼린저 밴드 (하단~상단)"] = f"{last['BB_Lower']:.2f} ~ {last['BB_Upper']:.2f}"
+        result["최대 낙폭(%)"] = f"{mdd * 100:.2f} ({peak:%Y-%m-%d} → {trough:%Y-%m-%d})"
+        result["현재 고점 대비(%)"] = round(float(last["Drawdown"]) * 100, 2)
+        return result
@@ -0,0 +1,159 @@
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# 지연 시간 히스토그램 버킷 경계(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 디버그 패널의 백분위 계산에 사용하는 단계별 최근 표본 수
+RECENT_SAMPLES = 500
+
+
+class _Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+
+
+class MetricsRegistry:
+    """
+    단계별 지연 시간 히스토그램, 호출/오류/재시도 카운터, 캐시 적중률을 프로세스 전역으로 집계합니다.
+    외부 호출(yfinance, AlphaVantage, 번역, OpenAI)과 무거운 로컬 단계(포맷팅, 프롬프트 생성)에 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, _Histogram] = defaultdict(_Histogram)
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+
+    # --- 기록 ---
+
+    def observe(self, stage: str, seconds: float, error: bool = False):
+        with self._lock:
+            self._histograms[stage].observe(seconds)
+            self._counters[("stage_calls_total", (("stage", stage),))] += 1
+            if error:
+                self._counters[("stage_errors_total", (("stage", stage),))] += 1
+
+    def count(self, name: str, value: float = 1, **labels):
+        """임의 카운터를 증가시킵니다. 예) count("retries_total", service="yfinance")"""
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def record_cache(self, cache: str, result: str):
+        """캐시 조회 결과를 기록합니다. result: hit / miss / stale"""
+        self.count("cache_requests_total", cache=cache, result=result)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """with 블록의 실행 시간을 `stage` 이름으로 기록합니다. 예외가 나면 오류로도 집계합니다."""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, error)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # --- 조회 ---
+
+    def stage_summary(self) -> list[dict]:
+        """단계별 호출 수, 오류 수, 평균/p50/p95 지연 시간(ms)을 반환합니다. (디버그 패널용)"""
+        with self._lock:
+            rows = []
+            for stage, hist in sorted(self._histograms.items()):
+                recent = sorted(hist.recent)
+                pick = (lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] * 1000) if recent else (lambda q: 0.0)
+                rows.append({
+                    "stage": stage,
+                    "calls": hist.count,
+                    "errors": int(self._counters.get(("stage_errors_total", (("stage", stage),)), 0)),
+                    "avg_ms": round(hist.total / hist.count * 1000, 1) if hist.count else 0.0,
+                    "p50_ms": round(pick(0.5), 1),
+                    "p95_ms": round(pick(0.95), 1),
+                })
+            return rows
+
+    def cache_summary(self) -> list[dict]:
+        """캐시별 hit/miss/stale 수와 적중률을 반환합니다."""
+        with self._lock:
+            by_cache: dict[str, dict] = defaultdict(lambda: {"hit": 0, "miss": 0, "stale": 0})
+            for (name, labels), value in self._counters.items():
+                if name == "cache_requests_total":
+                    label_map = dict(labels)
+                    by_cache[label_map["cache"]][label_map["result"]] += int(value)
+        rows = []
+        for cache, counts in sorted(by_cache.items()):
+            total = sum(counts.values())
+            rows.append({"cache": cache, **counts, "hit_ratio": round((counts["hit"] + counts["stale"]) / total, 3) if total else 0.0})
+        return rows
+
+    def counters(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                name + ("{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 모든 지표를 반환합니다."""
+        lines = []
+        with self._lock:
+            lines.append("# TYPE stage_latency_seconds histogram")
+            for stage, hist in sorted(self._histograms.items()):
+                for bound, bucket_count in zip(LATENCY_BUCKETS, hist.bucket_counts):
+                    lines.append(f'stage_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {bucket_count}')
+                lines.append(f'stage_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+                lines.append(f'stage_latency_seconds_sum{{stage="{stage}"}} {hist.total:.6f}')
+                lines.append(f'stage_latency_seconds_count{{stage="{stage}"}} {hist.count}')
+            counter_names = sorted({name for name, _ in self._counters})
+            for name in counter_names:
+                lines.append(f"# TYPE {name} counter")
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name != name:
+                        continue
+                    label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def timed(stage: str):
+    """함수 실행 시간을 `stage` 이름으로 기록하는 데코레이터입니다. (일반/코루틴 함수 지원)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with metrics.timer(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
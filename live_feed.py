@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+import zlib
+from datetime import datetime, time as dtime
+
+import numpy as np
+import pandas as pd
+
+from gateway import get_gateway
+from instrumentation import metrics
+from price_store import OHLCV_COLUMNS, yf_history
+
+# 종목 코드 접미사별 거래소 정규장 (시간대, 개장, 폐장). 접미사가 없으면 미국 시장으로 봅니다.
+MARKET_SESSIONS = {
+    ".KS": ("Asia/Seoul", dtime(9, 0), dtime(15, 30)),
+    ".KQ": ("Asia/Seoul", dtime(9, 0), dtime(15, 30)),
+    ".T": ("Asia/Tokyo", dtime(9, 0), dtime(15, 0)),
+}
+DEFAULT_MARKET_SESSION = ("America/New_York", dtime(9, 30), dtime(16, 0))
+
+
+def market_session(symbol: str) -> tuple[str, dtime, dtime]:
+    for suffix, session in MARKET_SESSIONS.items():
+        if symbol.upper().endswith(suffix):
+            return session
+    return DEFAULT_MARKET_SESSION
+
+
+def is_market_open(symbol: str, now: datetime | None = None) -> bool:
+    """거래소 현지 시각 기준으로 평일 정규장 시간인지 확인합니다. (공휴일은 봉이 들어오지 않는 것으로 판단)"""
+    tz, open_at, close_at = market_session(symbol)
+    now = pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz="UTC")
+    local = (now if now.tzinfo is not None else now.tz_localize("UTC")).tz_convert(tz)
+    return local.weekday() < 5 and open_at <= local.time() < close_at
+
+
+class YahooIntradayFeed:
+    """yfinance 당일 1분봉 피드입니다. 호출은 yfinance 관문(호출 속도 제한, 429 재시도)을 거칩니다."""
+
+    async def fetch_bars(self, symbol: str, since: pd.Timestamp | None = None) -> pd.DataFrame:
+        bars = await asyncio.to_thread(get_gateway("yfinance").call, ("intraday", symbol), self._download, symbol)
+        return bars if since is None else bars.loc[bars.index >= since]
+
+    @staticmethod
+    def _download(symbol: str) -> pd.DataFrame:
+        df = yf_history(symbol, "yfinance.intraday", period="1d", interval="1m")
+        if getattr(df.index, "tz", None) is not None:
+            # 일봉 데이터와 같이 거래소 현지 시각(tz 없음)으로 맞춥니다.
+            df.index = df.index.tz_convert(market_session(symbol)[0]).tz_localize(None)
+        return df
+
+
+class SimulatedQuoteFeed:
+    """
+    외부 호출 없이 장중 1분봉을 만들어 내는 가짜 피드입니다. (LIVE_FEED=fake 화면 확인, 벤치마크/테스트용)
+    조회할 때마다 `bars_per_poll`개의 새 봉이 생기며, 종목 코드와 시각으로 시드를 고정한 랜덤 워크입니다.
+    """
+
+    def __init__(self, bars_per_poll: int = 1, start: str | None = None, start_price: float = 100.0):
+        self.bars_per_poll = bars_per_poll
+        self.start = pd.Timestamp(start) if start else pd.Timestamp.now().floor("min") - pd.Timedelta(minutes=30)
+        self.start_price = start_price
+        self._bars: dict[str, pd.DataFrame] = {}
+
+    def initial_price(self, symbol: str) -> float:
+        """첫 봉의 기준 가격"""
+        return self.start_price
+
+    def _generate(self, symbol: str) -> pd.DataFrame:
+        bars = self._bars.get(symbol)
+        if bars is None:
+            # 처음 조회하면 장 시작 후 30분치 봉이 이미 있는 것처럼 만듭니다.
+            count, last_close, start = 30, float(self.initial_price(symbol)), self.start
+        else:
+            count, last_close, start = self.bars_per_poll, float(bars["Close"].iloc[-1]), bars.index[-1] + pd.Timedelta(minutes=1)
+        index = pd.date_range(start, periods=count, freq="min", name="Datetime")
+        rng = np.random.default_rng(zlib.crc32(f"{symbol}{start}".encode("utf-8")))
+        close = last_close * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+        opens = np.concatenate([[last_close], close[:-1]])
+        spread = np.abs(rng.normal(0, 0.0005, count))
+        new = pd.DataFrame({
+            "Open": opens,
+            "High": np.maximum(opens, close) * (1 + spread),
+            "Low": np.minimum(opens, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(50_000, 300_000, count).astype(float),
+        }, index=index)
+        self._bars[symbol] = new if bars is None else pd.concat([bars, new])
+        return self._bars[symbol]
+
+    async def fetch_bars(self, symbol: str, since: pd.Timestamp | None = None) -> pd.DataFrame:
+        bars = self._generate(symbol)
+        return bars if since is None else bars.loc[bars.index >= since]
+
+
+class LiveQuoteStream:
+    """
+    한 종목의 장중 봉을 백그라운드 asyncio 작업으로 주기적으로 받아 메모리 시계열에 이어 붙입니다.
+
+    - 새 봉이 들어오면 `min_interval`초 간격으로, 변화가 없으면 간격을 두 배씩 늘려 `max_interval`까지 기다립니다.
+    - 장이 닫혀 있으면 `closed_interval`초마다 개장 여부만 확인합니다.
+    - `idle_timeout`초 동안 아무도 조회하지 않으면 스스로 종료합니다. (브라우저를 닫은 세션 정리)
+    """
+
+    def __init__(self, symbol: str, feed, market_clock=is_market_open, min_interval: float = 5,
+                 max_interval: float = 60, closed_interval: float = 300, idle_timeout: float = 120,
+                 max_bars: int = 2000):
+        self.symbol = symbol
+        self.feed = feed
+        self.market_clock = market_clock
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.closed_interval = closed_interval
+        self.idle_timeout = idle_timeout
+        self.max_bars = max_bars
+
+        self._lock = threading.Lock()
+        self._bars = pd.DataFrame(columns=OHLCV_COLUMNS)
+        self._future = None
+        self._last_access = time.monotonic()
+        self.version = 0 # 시계열이 바뀔 때마다 증가
+        self.status = "starting" # starting / live / closed / error / stopped
+        self.interval = min_interval
+
+    # --- 실행 제어 ---
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), loop)
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def touch(self):
+        self._last_access = time.monotonic()
+
+    async def _run(self):
+        try:
+            while time.monotonic() - self._last_access < self.idle_timeout:
+                market_open = self.market_clock(self.symbol)
+                # 장이 닫혀 있어도 처음 한 번은 직전 거래일 봉을 받아 보여줍니다.
+                if market_open or self.version == 0:
+                    try:
+                        bars = await self.feed.fetch_bars(self.symbol, self.last_timestamp)
+                    except Exception as e:
+                        metrics.count("external_errors_total", service="live_feed")
+                        print(f"실시간 시세 조회 실패 ({self.symbol}): {e}")
+                        self.status = "error"
+                        self.interval = min(self.interval * 2, self.max_interval)
+                    else:
+                        changed = self._append(bars)
+                        self.status = "live"
+                        self.interval = self.min_interval if changed else min(self.interval * 2, self.max_interval)
+                    metrics.count("live_polls_total", symbol=self.symbol)
+                if not market_open:
+                    self.status = "closed"
+                    await asyncio.sleep(self.closed_interval)
+                    continue
+                await asyncio.sleep(self.interval)
+        finally:
+            self.status = "stopped"
+
+    # --- 시계열 ---
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp | None:
+        bars = self._bars
+        return bars.index[-1] if not bars.empty else None
+
+    def _append(self, bars: pd.DataFrame) -> bool:
+        """새 봉을 이어 붙이고(같은 시각의 진행 중인 봉은 교체) 시계열이 바뀌었는지 반환합니다."""
+        if bars is None or bars.empty:
+            return False
+        bars = bars[[c for c in OHLCV_COLUMNS if c in bars.columns]].astype(float).sort_index()
+        with self._lock:
+            current = self._bars
+            if current.empty:
+                merged = bars
+            else:
+                overlap = current.loc[current.index >= bars.index[0]]
+                if overlap.equals(bars):
+                    return False
+                # 기존 DataFrame은 읽는 쪽과 공유하므로 수정하지 않고 새로 만듭니다.
+                merged = pd.concat([current.loc[current.index < bars.index[0]], bars])
+            self._bars = merged.iloc[-self.max_bars:]
+            self.version += 1
+        return True
+
+    def snapshot(self) -> tuple[int, pd.DataFrame]:
+        """(버전, 장중 봉 시계열)을 반환합니다. 반환된 DataFrame은 수정하지 않아야 합니다."""
+        self.touch()
+        with self._lock:
+            return self.version, self._bars
+
+    def daily_bar(self) -> pd.DataFrame | None:
+        """가장 최근 거래일의 장중 봉을 일봉 1개로 합칩니다. (일봉 시계열/지표 엔진 갱신용)"""
+        _, bars = self.snapshot()
+        if bars.empty:
+            return None
+        day = bars.index[-1].normalize()
+        today = bars.loc[bars.index >= day]
+        return pd.DataFrame({
+            "Close": [today["Close"].iloc[-1]],
+            "High": [today["High"].max()],
+            "Low": [today["Low"].min()],
+            "Open": [today["Open"].iloc[0]],
+            "Volume": [today["Volume"].sum()],
+        }, index=pd.DatetimeIndex([day], name="Date"))
+
+
+class LiveFeedHub:
+    """
+    실시간 시세 스트림 관리자입니다. 하나의 백그라운드 이벤트 루프 스레드에서 모든 스트림을 실행하며,
+    같은 종목을 보는 세션들은 스트림 하나(외부 조회 한 번)를 공유합니다.
+    """
+
+    def __init__(self, feed=None, market_clock=is_market_open, **stream_options):
+        self.feed = feed or YahooIntradayFeed()
+        self.market_clock = market_clock
+        self.stream_options = stream_options
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._streams: dict[str, LiveQuoteStream] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True, name="live-feed").start()
+        return self._loop
+
+    def subscribe(self, symbol: str) -> LiveQuoteStream:
+        """종목의 실시간 스트림을 반환합니다. 실행 중인 스트림이 없으면 새로 시작합니다."""
+        with self._lock:
+            stream = self._streams.get(symbol)
+            if stream is None or not stream.running:
+                stream = LiveQuoteStream(symbol, self.feed, self.market_clock, **self.stream_options)
+                stream.start(self._ensure_loop())
+                self._streams[symbol] = stream
+        stream.touch()
+        return stream
+
+    def stop_all(self):
+        with self._lock:
+            for stream in self._streams.values():
+                stream.stop()
+            self._streams.clear()
@@ -1,19 +1,113 @@
-import openai
-from dotenv import load_dotenv
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+
+import pandas as pd
 import os
 
+from import_profiler import lazy_import
+from instrumentation import metrics, timed
+
+
+class ResponseCache:
+    """
+    AI 답변 캐시입니다. (정규화한 프롬프트 + 데이터 지문 + 모델 파라미터를 키로 사용)
+    TTL이 지난 항목은 무효로 처리하고, `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int, data_fingerprint: str = "") -> str:
+        # 공백/줄바꿈 차이만 있는 프롬프트는 같은 질문으로 취급합니다.
+        normalized = " ".join(prompt.split())
+        payload = json.dumps([normalized, data_fingerprint, model, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def fingerprint_dataframe(df) -> str:
+    """DataFrame 내용(인덱스 포함)의 해시를 반환합니다. 캐시 키의 데이터 지문으로 사용합니다."""
+    if df is None:
+        return ""
+    hashed = pd.util.hash_pandas_object(df, index=True).values
+    return hashlib.sha256(hashed.tobytes() + ",".join(map(str, df.columns)).encode("utf-8")).hexdigest()
+
+
+def _openai_api_error():
+    # except 절에서 쓰는 예외 타입도 openai 모듈을 로드한 뒤에 가져옵니다.
+    return lazy_import("openai").APIError
+
+
+# 프로세스 전체(모든 Streamlit 세션)가 공유하는 기본 답변 캐시
+_shared_cache = ResponseCache()
+
+
 class OpenAIService:
-    def __init__(self):
-        load_dotenv()
+    def __init__(self, client=None, async_client=None, cache: ResponseCache | None = None):
+        """
+        `client`/`async_client`를 넘기면 해당 객체를 사용합니다. (테스트용 로컬 스텁 등)
+        넘기지 않으면 OPENAI_API_KEY 환경 변수로 OpenAI 클라이언트를 생성합니다.
+        """
+        self.cache = cache if cache is not None else _shared_cache
+        self._async_client = async_client
+        if client is not None:
+            self.openai_api_key = None
+            self.client = client
+            return
+
+        lazy_import("dotenv").load_dotenv()
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-        self.client = openai.OpenAI(api_key=self.openai_api_key)
+        self.client = lazy_import("openai").OpenAI(api_key=self.openai_api_key)
 
-    def get_qa_response(self, prompt: str, model: str = "gpt-4o", temperature: float = 0.5, max_tokens: int = 700) -> str:
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = lazy_import("openai").AsyncOpenAI(api_key=self.openai_api_key)
+        return self._async_client
+
+    @timed("get_qa_response")
+    def get_qa_response(self, prompt: str, model: str = "gpt-4o", temperature: float = 0.5, max_tokens: int = 700,
+                        data_fingerprint: str = "") -> str:
         """
         OpenAI API를 사용하여 질문에 대한 답변을 생성합니다.
+        같은 프롬프트/데이터/파라미터의 답변이 캐시에 있으면 API를 호출하지 않습니다.
         """
+        key = self.cache.make_key(prompt, model, temperature, max_tokens, data_fingerprint)
+        cached = self.cache.get(key)
+        metrics.record_cache("ai_response", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
         try:
             response = self.client.chat.completions.create(
                 model=model,
@@ -21,8 +115,81 @@ class OpenAIService:
                 temperature=temperature,
                 max_tokens=max_tokens
             )
-            return response.choices[0].message.content.strip()
-        except openai.APIError as e:
+            answer = response.choices[0].message.content.strip()
+            self.cache.put(key, answer)
+            return answer
+        except _openai_api_error() as e:
+            metrics.count("external_errors_total", service="openai")
+            return f"❌ OpenAI API 오류: {e}"
+        except Exception as e:
+            metrics.count("external_errors_total", service="openai")
+            return f"❌ AI 답변 생성 중 오류 발생: {e}"
+
+    def stream_qa_response(self, prompt: str, model: str = "gpt-4o", temperature: float = 0.5, max_tokens: int = 700,
+                           data_fingerprint: str = "") -> Iterator[str]:
+        """
+        답변을 토큰 단위로 yield합니다. (st.write_stream 등으로 점진적으로 표시)
+        캐시된 답변은 한 번에 yield하며, 스트림이 끝까지 완료된 답변만 캐시에 저장합니다.
+        """
+        key = self.cache.make_key(prompt, model, temperature, max_tokens, data_fingerprint)
+        cached = self.cache.get(key)
+        metrics.record_cache("ai_response", "hit" if cached is not None else "miss")
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        started = time.perf_counter()
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not parts:
+                        # 사용자가 체감하는 첫 토큰까지의 시간
+                        metrics.observe("openai.first_token", time.perf_counter() - started)
+                    parts.append(delta)
+                    yield delta
+            metrics.observe("openai.stream", time.perf_counter() - started)
+            self.cache.put(key, "".join(parts).strip())
+        except _openai_api_error() as e:
+            metrics.observe("openai.stream", time.perf_counter() - started, error=True)
+            metrics.count("external_errors_total", service="openai")
+            yield f"❌ OpenAI API 오류: {e}"
+        except Exception as e:
+            metrics.observe("openai.stream", time.perf_counter() - started, error=True)
+            metrics.count("external_errors_total", service="openai")
+            yield f"❌ AI 답변 생성 중 오류 발생: {e}"
+
+    @timed("aget_qa_response")
+    async def aget_qa_response(self, prompt: str, model: str = "gpt-4o", temperature: float = 0.5, max_tokens: int = 700,
+                               data_fingerprint: str = "") -> str:
+        """get_qa_response의 비동기 버전입니다. (AsyncOpenAI 클라이언트 사용)"""
+        key = self.cache.make_key(prompt, model, temperature, max_tokens, data_fingerprint)
+        cached = self.cache.get(key)
+        metrics.record_cache("ai_response", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            answer = response.choices[0].message.content.strip()
+            self.cache.put(key, answer)
+            return answer
+        except _openai_api_error() as e:
+            metrics.count("external_errors_total", service="openai")
             return f"❌ OpenAI API 오류: {e}"
         except Exception as e:
-            return f"❌ AI 답변 생성 중 오류 발생: {e}"
\ No newline at end of file
+            metrics.count("external_errors_total", service="openai")
+            return f"❌ AI 답변 생성 중 오류 발생: {e}"
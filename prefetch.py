@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from instrumentation import metrics
+from utils import get_today_usd_to_krw_rate, translate_to_korean
+
+# 미리 받아 둘 기본 주가 조회 구간 (주가 히스토리 섹션의 기본 시작일과 같음)
+DEFAULT_PRICE_DAYS = 7
+
+# 스냅샷 항목 (기업 정보, USD/KRW 환율, 사업 설명 번역, 기본 구간 주가)
+SNAPSHOT_ITEMS = ("info", "fx_rate", "summary_ko", "price")
+
+
+def default_price_window(days: int = DEFAULT_PRICE_DAYS) -> tuple[str, str]:
+    end = datetime.today()
+    return (end - timedelta(days=days)).strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+
+def _is_empty(value) -> bool:
+    # get_price_data_adjusted는 조회 실패 시 (None, None)을 돌려줍니다.
+    return value is None or (isinstance(value, tuple) and all(v is None for v in value))
+
+
+class SymbolSnapshot:
+    """
+    한 종목에 대해 미리 시작해 둔 조회 결과 묶음입니다.
+    항목: info(기업 정보), fx_rate(USD/KRW 환율), summary_ko(사업 설명 번역), price(기본 구간 주가)
+    """
+
+    def __init__(self, symbol: str, price_window: tuple[str, str], futures: dict[str, Future]):
+        self.symbol = symbol
+        self.price_window = price_window
+        self.created_at = time.monotonic()
+        self._futures = futures
+
+    def get(self, name: str, timeout: float | None = None):
+        """결과를 반환합니다. 아직 조회 중이면 끝날 때까지 기다리며, 실패하면 None을 반환합니다."""
+        future = self._futures[name]
+        metrics.record_cache("prefetch", "hit" if future.done() else "miss")
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            print(f"미리 조회 실패 ({self.symbol}, {name}): {e}")
+            return None
+
+    def failed(self) -> list[str]:
+        """끝난 조회 중 예외가 났거나 빈 결과(None, (None, None))를 돌려준 항목"""
+        names = []
+        for name, future in self._futures.items():
+            if not future.done():
+                continue
+            if future.cancelled() or future.exception() is not None or _is_empty(future.result()):
+                names.append(name)
+        return names
+
+    def status(self) -> dict[str, str]:
+        """항목별 진행 상태 (done / pending / failed)"""
+        return {
+            name: "pending" if not f.done() else ("failed" if f.exception() else "done")
+            for name, f in self._futures.items()
+        }
+
+
+class Prefetcher:
+    """
+    종목이 입력되면 기업 정보, 환율, 사업 설명 번역, 기본 구간 주가를 동시에 조회해 종목별 스냅샷으로 보관합니다.
+    프로세스 전체(모든 Streamlit 세션)가 스냅샷을 공유하며, `ttl`초가 지나면 다시 조회합니다.
+    실패한 항목(예외/빈 결과)은 보관하지 않고 다음 prefetch 호출 때 그 항목만 다시 조회합니다.
+    각 조회는 기존 캐시(get_info 캐시, 환율/번역 캐시, 가격 저장소)를 그대로 거칩니다.
+    """
+
+    def __init__(self, data_manager, max_workers: int = 8, ttl: float = 300, max_symbols: int = 64):
+        self.data_manager = data_manager
+        self.ttl = ttl
+        self.max_symbols = max_symbols
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._snapshots: OrderedDict[str, SymbolSnapshot] = OrderedDict()
+
+    def _then(self, future: Future, func) -> Future:
+        """`future`가 끝나면 그 결과로 `func`를 풀에서 실행하는 Future를 반환합니다. (대기하며 스레드를 점유하지 않음)"""
+        chained = Future()
+
+        def run(done: Future):
+            try:
+                inner = self._pool.submit(func, done.result())
+            except Exception as e:
+                chained.set_exception(e)
+                return
+            inner.add_done_callback(
+                lambda f: chained.set_exception(f.exception()) if f.exception() else chained.set_result(f.result())
+            )
+
+        future.add_done_callback(run)
+        return chained
+
+    @staticmethod
+    def _translate_summary(info: dict | None) -> str:
+        summary = (info or {}).get("longBusinessSummary", "")
+        return translate_to_korean(summary) if summary else ""
+
+    def _start(self, symbol: str, price_window: tuple[str, str], names, futures: dict[str, Future]):
+        """`names` 항목의 조회를 시작해 `futures`에 넣습니다. 번역은 (새로 시작한) 기업 정보 조회에 이어 실행합니다."""
+        if "info" in names:
+            futures["info"] = self._pool.submit(self.data_manager.get_info, symbol)
+        if "fx_rate" in names:
+            futures["fx_rate"] = self._pool.submit(get_today_usd_to_krw_rate)
+        if "info" in names or "summary_ko" in names:
+            futures["summary_ko"] = self._then(futures["info"], self._translate_summary)
+        if "price" in names:
+            futures["price"] = self._pool.submit(self.data_manager.get_price_data_adjusted, symbol, *price_window)
+
+    def prefetch(self, symbol: str) -> SymbolSnapshot:
+        """
+        종목 스냅샷을 반환합니다. 없거나 오래된 경우 모든 항목의 조회를 동시에 시작하고,
+        실패한 항목이 있으면 그 항목만 다시 시작합니다. (일시적인 429 등이 ttl 동안 모든 세션에 남지 않도록)
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(symbol)
+            if snapshot is not None and time.monotonic() - snapshot.created_at < self.ttl:
+                failed = snapshot.failed()
+                if failed:
+                    self._start(symbol, snapshot.price_window, failed, snapshot._futures)
+                    metrics.count("prefetch_retried_total")
+                self._snapshots.move_to_end(symbol)
+                return snapshot
+
+            window = default_price_window()
+            futures: dict[str, Future] = {}
+            self._start(symbol, window, SNAPSHOT_ITEMS, futures)
+            snapshot = SymbolSnapshot(symbol, window, futures)
+            self._snapshots[symbol] = snapshot
+            self._snapshots.move_to_end(symbol)
+            while len(self._snapshots) > self.max_symbols:
+                self._snapshots.popitem(last=False)
+            metrics.count("prefetch_started_total")
+        return snapshot
+
+    def wait(self, timeout: float | None = None):
+        """보관 중인 스냅샷의 진행 중인 조회가 모두 끝날 때까지 기다립니다. (벤치마크/종료 처리용)"""
+        with self._lock:
+            futures = [f for snapshot in self._snapshots.values() for f in snapshot._futures.values()]
+        wait(futures, timeout=timeout)
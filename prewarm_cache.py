@@ -0,0 +1,34 @@
+"""
+데이터 캐시 사전 적재(pre-warm) 스크립트입니다. cron 등에서 실행해 앱과 같은 캐시 백엔드를 미리 채웁니다.
+
+예) STOCK_CACHE_BACKEND=redis python prewarm_cache.py AAPL MSFT NVDA --days 7
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from cache_backend import create_cache_backend
+from data_manager import YahooFinanceDataManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주가/기업 정보 캐시 사전 적재")
+    parser.add_argument("symbols", nargs="+", help="종목 코드 목록")
+    parser.add_argument("--days", type=int, default=7, help="조회 기간 (앱 기본값과 같은 7일)")
+    parser.add_argument("--backend", default=None, help="memory / disk / redis (기본: STOCK_CACHE_BACKEND)")
+    args = parser.parse_args()
+
+    data_manager = YahooFinanceDataManager(cache=create_cache_backend(args.backend))
+    today = datetime.today()
+    start = (today - timedelta(days=args.days)).strftime("%Y-%m-%d")
+    end = today.strftime("%Y-%m-%d")
+    symbols = [s.strip().upper() for s in args.symbols]
+
+    prices = data_manager.get_price_data_batch(symbols, start, end)
+    infos = data_manager.get_info_batch(symbols)
+    for symbol in symbols:
+        print(f"{symbol}: 주가 {len(prices.get(symbol, []))}건, 기업 정보 {'있음' if infos.get(symbol) else '없음'}")
+    print(f"캐시 통계: {data_manager.cache.stats.as_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from gateway import get_gateway
+from import_profiler import lazy_import
+from instrumentation import metrics
+
+# 저장소 기본 위치 (STOCK_CACHE_DIR 환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.getenv("STOCK_CACHE_DIR", ".cache")
+
+# 수정주가(배당/분할 반영)가 바뀌었는지 판단할 때 사용하는 상대 오차
+ADJUSTMENT_TOLERANCE = 1e-6
+
+# 저장하는 주가 컬럼 (Ticker.history의 배당/분할 컬럼은 제외)
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """yfinance가 반환하는 멀티 레벨 컬럼을 단일 레벨로 평탄화합니다."""
+    df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+    return df
+
+
+def yf_history(symbol: str, timer: str, **kwargs) -> pd.DataFrame:
+    """
+    yfinance Ticker.history로 주가를 받습니다.
+    yf.download와 달리 요청 한도 초과(YFRateLimitError)를 빈 결과로 삼키지 않고 그대로 올리므로, 관문이 재시도할 수 있습니다.
+    """
+    yf = lazy_import("yfinance") # 실제로 내려받을 때만 로드
+    yf.config.network.hide_exceptions = False
+    with metrics.timer(timer):
+        df = yf.Ticker(symbol).history(auto_adjust=True, **kwargs)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return flatten_columns(df)[[c for c in OHLCV_COLUMNS if c in df.columns]]
+
+
+def _yf_download(symbol: str, start: str, end: str) -> pd.DataFrame:
+    return yf_history(symbol, "yfinance.download", start=start, end=end)
+
+
+class PriceStore:
+    """
+    종목별 OHLCV 데이터를 로컬 Parquet 파일로 보관하는 저장소입니다.
+
+    이미 받아 둔 구간은 디스크에서 읽고, 요청 구간 중 저장되지 않은
+    앞(head)/뒤(tail) 구간만 yfinance에서 추가로 내려받습니다.
+    """
+
+    def __init__(self, root: str | None = None, fetcher=None):
+        self.root = Path(root or DEFAULT_CACHE_DIR) / "prices"
+        self.root.mkdir(parents=True, exist_ok=True)
+        # fetcher(symbol, start, end) -> DataFrame, 기본값은 yfinance Ticker.history
+        self._fetch = fetcher or self._download
+        self._locks = defaultdict(threading.Lock)
+
+    @staticmethod
+    def _download(symbol: str, start: str, end: str) -> pd.DataFrame:
+        # 모든 세션의 다운로드는 yfinance 관문(동일 요청 병합, 호출 속도 제한, 429 재시도)을 거칩니다.
+        return get_gateway("yfinance").call(("download", symbol, start, end), _yf_download, symbol, start, end)
+
+    # --- 파일 입출력 ---
+
+    def _data_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol}.parquet"
+
+    def _meta_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol}.json"
+
+    def _load(self, symbol: str) -> tuple[pd.DataFrame | None, dict | None]:
+        data_path, meta_path = self._data_path(symbol), self._meta_path(symbol)
+        if not data_path.exists() or not meta_path.exists():
+            return None, None
+        try:
+            try:
+                bars = pd.read_parquet(data_path)
+            except ImportError:
+                # pyarrow/fastparquet이 없는 환경에서는 pickle로 저장됩니다.
+                bars = pd.read_pickle(data_path)
+            meta = json.loads(meta_path.read_text())
+            return bars, meta
+        except Exception as e:
+            print(f"가격 저장소 읽기 실패 ({symbol}): {e}")
+            return None, None
+
+    def _save(self, symbol: str, bars: pd.DataFrame, meta: dict):
+        data_path, meta_path = self._data_path(symbol), self._meta_path(symbol)
+        tmp_path = data_path.with_suffix(".tmp")
+        try:
+            bars.to_parquet(tmp_path)
+        except ImportError:
+            bars.to_pickle(tmp_path)
+        # 쓰기 도중 중단되거나 다른 세션이 동시에 읽어도 깨진 파일이 보이지 않도록 원자적으로 교체합니다.
+        os.replace(tmp_path, data_path)
+        tmp_meta_path = meta_path.with_suffix(".json.tmp")
+        tmp_meta_path.write_text(json.dumps(meta))
+        os.replace(tmp_meta_path, meta_path)
+
+    def clear(self, symbol: str):
+        """저장된 종목 데이터를 삭제합니다."""
+        for path in (self._data_path(symbol), self._meta_path(symbol)):
+            path.unlink(missing_ok=True)
+
+    # --- 조회 ---
+
+    def _fetch_range(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        df = self._fetch(symbol, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        if df is None or df.empty:
+            return pd.DataFrame()
+        df = flatten_columns(df.copy())
+        df.index = pd.to_datetime(df.index).tz_localize(None)
+        df.index.name = "Date"
+        return df
+
+    @staticmethod
+    def _merge(bars: pd.DataFrame | None, new: pd.DataFrame) -> pd.DataFrame:
+        if bars is None or bars.empty:
+            return new.sort_index()
+        if new.empty:
+            return bars
+        merged = pd.concat([bars, new])
+        # 겹치는 날짜는 새로 받은 값을 우선합니다.
+        merged = merged[~merged.index.duplicated(keep="last")]
+        return merged.sort_index()
+
+    @staticmethod
+    def _is_readjusted(bars: pd.DataFrame, new: pd.DataFrame, today: pd.Timestamp) -> bool:
+        """
+        겹치는 마지막 확정 봉(오늘 이전)의 종가가 달라졌다면 배당/분할로 수정주가가 재계산된 것입니다.
+        오늘 봉은 장중에 계속 바뀌므로 비교하지 않습니다.
+        """
+        if bars is None or new.empty or "Close" not in new.columns:
+            return False
+        settled = bars.index[bars.index < today]
+        if settled.empty:
+            return False
+        overlap = settled[-1]
+        if overlap not in new.index:
+            return False
+        old_close = float(bars.at[overlap, "Close"])
+        new_close = float(new.at[overlap, "Close"])
+        return abs(new_close - old_close) > ADJUSTMENT_TOLERANCE * max(abs(old_close), 1.0)
+
+    def get(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        """
+        [start, end) 구간의 주가 데이터를 반환합니다. (yfinance와 동일하게 end는 제외)
+        저장소에 없는 앞/뒤 구간만 내려받아 병합한 뒤 요청 구간을 잘라서 돌려줍니다.
+        """
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        # 오늘 봉은 장중에 계속 바뀌므로 '어제까지'만 확정된 구간으로 기록합니다.
+        today = pd.Timestamp.today().normalize()
+
+        with self._locks[symbol]:
+            bars, meta = self._load(symbol)
+            if bars is None:
+                covered_start, covered_end = start_ts, start_ts
+                missing = [(start_ts, end_ts)]
+            else:
+                covered_start = pd.Timestamp(meta["covered_start"])
+                covered_end = pd.Timestamp(meta["covered_end"])
+                missing = []
+                if start_ts < covered_start:
+                    missing.append((start_ts, covered_start))
+                if end_ts > covered_end:
+                    # 마지막 확정 봉 하나를 겹쳐 받아 수정주가 변경 여부를 확인합니다.
+                    settled = bars.index[bars.index < today]
+                    tail_start = settled[-1] if not settled.empty else covered_end
+                    missing.append((min(tail_start, covered_end), end_ts))
+
+            # 요청 구간이 모두 저장되어 있으면 적중(hit), 일부라도 받아야 하면 실패(miss)
+            metrics.record_cache("price_store", "miss" if missing else "hit")
+            try:
+                for seg_start, seg_end in missing:
+                    new = self._fetch_range(symbol, seg_start, seg_end)
+                    if seg_end > covered_end and self._is_readjusted(bars, new, today):
+                        # 과거 가격 전체가 바뀌었으므로 기존 데이터를 버리고, 저장해 두었던 구간 전체를 다시 받습니다.
+                        print(f"수정주가 변경 감지 ({symbol}): 저장 데이터를 다시 받습니다.")
+                        refetch_start = min(covered_start, start_ts)
+                        bars = None
+                        covered_start, covered_end = refetch_start, refetch_start
+                        new = self._fetch_range(symbol, refetch_start, seg_end)
+                        seg_start = refetch_start
+                    bars = self._merge(bars, new)
+                    if new.empty and (bars.empty or bars.index[-1] < seg_start):
+                        # yfinance는 오류 시에도 빈 결과를 돌려주므로, 뒤쪽 빈 구간은
+                        # '데이터 없음'으로 확정하지 않고 다음 조회 때 다시 확인합니다.
+                        continue
+                    covered_start = min(covered_start, seg_start)
+                    covered_end = max(covered_end, min(seg_end, today))
+            finally:
+                # 장중에 바뀌는 오늘(및 이후) 봉은 저장하지 않습니다. 반환값에는 이번에 받은 오늘 봉도 포함됩니다.
+                # (알 수 없는/상장 폐지 종목은 빈 결과의 인덱스가 날짜가 아니므로 비교하지 않습니다.)
+                settled_bars = bars.loc[bars.index < today] if bars is not None and not bars.empty else None
+                if settled_bars is not None and not settled_bars.empty and covered_end > covered_start:
+                    self._save(symbol, settled_bars, {
+                        "covered_start": covered_start.strftime("%Y-%m-%d"),
+                        "covered_end": covered_end.strftime("%Y-%m-%d"),
+                    })
+
+        if bars is None or bars.empty:
+            return pd.DataFrame()
+        return bars.loc[(bars.index >= start_ts) & (bars.index < end_ts)]
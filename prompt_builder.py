@@ -0,0 +1,150 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from backtest import BacktestResult
+from indicators import IndicatorEngine
+from instrumentation import timed
+
+# AI 프롬프트에 포함할 주가 데이터의 기본 토큰 예산 (AI_PROMPT_TOKEN_BUDGET 환경 변수로 변경 가능)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "3000"))
+
+# 예산 중 최근 일봉 데이터에 배정하는 비율 (나머지는 과거 요약 봉)
+RECENT_SHARE = 0.6
+
+# 과거 구간을 요약할 때 차례로 시도하는 리샘플링 단위 (주봉 → 월봉 → 분기봉)
+RESAMPLE_RULES = [("W-FRI", "주봉"), ("MS", "월봉"), ("QS", "분기봉")]
+
+OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 보수적으로 추정합니다.
+    영문/숫자는 약 4글자당 1토큰, 한글 등 비ASCII 문자는 1글자당 1토큰으로 계산합니다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars))
+
+
+def _table_text(df: pd.DataFrame) -> str:
+    out = df.reset_index()
+    out["Date"] = pd.to_datetime(out["Date"]).dt.strftime("%Y-%m-%d")
+    if "Volume" in out.columns:
+        out["Volume"] = out["Volume"].fillna(0).astype("int64")
+    cols = [c for c in ["Date", "Open", "High", "Low", "Close", "Volume"] if c in out.columns]
+    # to_string보다 공백이 적은 CSV 형식으로 토큰을 절약합니다.
+    return out[cols].to_csv(index=False, float_format="%.2f").strip()
+
+
+def resample_ohlcv(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """일봉 OHLCV를 주어진 주기의 봉으로 집계합니다."""
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in df.columns}
+    return df.resample(rule).agg(agg).dropna(subset=["Close"])
+
+
+def compute_price_stats(df: pd.DataFrame, indicators: IndicatorEngine | None = None) -> dict:
+    """
+    수익률, 변동성, 거래량 이상치 등 프롬프트용 요약 통계를 계산합니다.
+    최대 낙폭, 이동평균, RSI, MACD 등은 지표 엔진(IndicatorEngine)의 최신 값으로 채웁니다.
+    """
+    close = df["Close"].astype(float)
+    returns = close.pct_change().dropna()
+    stats = {
+        "거래일 수": len(df),
+        "시작 종가": round(float(close.iloc[0]), 2),
+        "마지막 종가": round(float(close.iloc[-1]), 2),
+        "기간 수익률(%)": round(float(close.iloc[-1] / close.iloc[0] - 1) * 100, 2),
+        "기간 최고가": round(float(df["High"].max() if "High" in df else close.max()), 2),
+        "기간 최저가": round(float(df["Low"].min() if "Low" in df else close.min()), 2),
+    }
+    if len(returns) > 1:
+        stats["일간 변동성(%)"] = round(float(returns.std()) * 100, 2)
+        stats["연환산 변동성(%)"] = round(float(returns.std() * np.sqrt(252)) * 100, 2)
+        stats["최대 일간 상승(%)"] = f"{returns.max() * 100:.2f} ({returns.idxmax():%Y-%m-%d})"
+        stats["최대 일간 하락(%)"] = f"{returns.min() * 100:.2f} ({returns.idxmin():%Y-%m-%d})"
+
+    stats.update((indicators or IndicatorEngine(df)).summary())
+
+    if "Volume" in df.columns and len(df) > 20:
+        volume = df["Volume"].astype(float)
+        stats["평균 거래량"] = f"{volume.mean():,.0f}"
+        zscore = (volume - volume.mean()) / volume.std()
+        spikes = zscore[zscore > 2].nlargest(5)
+        if not spikes.empty:
+            stats["거래량 급증일"] = ", ".join(
+                f"{day:%Y-%m-%d}({volume[day] / volume.mean():.1f}배)" for day in spikes.index
+            )
+    return stats
+
+
+@timed("build_price_prompt")
+def build_price_prompt(symbol: str, start, end, df: pd.DataFrame, question: str,
+                       token_budget: int = DEFAULT_TOKEN_BUDGET, indicators: IndicatorEngine | None = None,
+                       backtests: list[BacktestResult] | None = None) -> str:
+    """
+    AI Q&A용 프롬프트를 만듭니다.
+    요약 통계를 먼저 넣고, 최근 일봉은 그대로, 그 이전 구간은 주봉/월봉/분기봉으로 줄여
+    주가 데이터 부분이 `token_budget` 안에 들어가도록 구성합니다.
+    이미 계산된 지표 엔진을 `indicators`로 넘기면 지표를 다시 계산하지 않습니다.
+    `backtests`(전략 백테스트 결과)를 넘기면 전략별 성과 지표를 요약 통계 뒤에 함께 넣습니다.
+    """
+    df = df.sort_index()
+    stats = compute_price_stats(df, indicators)
+    stats_text = "\n".join(f"- {k}: {v}" for k, v in stats.items())
+    if backtests:
+        # 백테스트 요약도 요약 통계와 같이 예산에서 먼저 차감합니다.
+        stats_text += "\n\n--- 전략 백테스트 결과 (거래 비용 반영, 다음 날 종가부터 보유) ---\n" + "\n".join(
+            "- " + ", ".join(f"{k}: {v}" for k, v in result.summary().items()) for result in backtests
+        )
+
+    # 최근 일봉: 한 줄당 토큰 수로 개수를 추정한 뒤, 예산에 맞을 때까지 줄입니다.
+    header_text = _table_text(df.iloc[:0])
+    row_tokens = max(1, estimate_tokens(_table_text(df.iloc[-1:])) - estimate_tokens(header_text))
+    daily_budget = int(token_budget * RECENT_SHARE) - estimate_tokens(stats_text)
+    n_recent = max(1, min(len(df), daily_budget // row_tokens))
+    recent = df.iloc[-n_recent:]
+    recent_text = _table_text(recent)
+    while n_recent > 1 and estimate_tokens(recent_text) > daily_budget:
+        n_recent = max(1, n_recent * 3 // 4)
+        recent = df.iloc[-n_recent:]
+        recent_text = _table_text(recent)
+
+    # 과거 구간: 예산에 맞는 가장 세밀한 주기로 요약합니다.
+    older = df.iloc[:-n_recent]
+    older_section = ""
+    if not older.empty:
+        older_budget = token_budget - estimate_tokens(stats_text) - estimate_tokens(recent_text)
+        for rule, label in RESAMPLE_RULES:
+            bars = resample_ohlcv(older, rule)
+            older_text = _table_text(bars)
+            if estimate_tokens(older_text) <= older_budget:
+                break
+        else:
+            # 분기봉으로도 넘치면 가장 오래된 봉부터 제외합니다.
+            keep = max(1, older_budget // row_tokens)
+            older_text = _table_text(bars.iloc[-keep:])
+        older_section = f"""
+--- 과거 구간 {label} 요약 ({older.index[0]:%Y-%m-%d} ~ {older.index[-1]:%Y-%m-%d}) ---
+{older_text}
+"""
+
+    return f"""
+아래는 {symbol}의 {start}부터 {end}까지의 주가 데이터입니다.
+이 데이터는 날짜(Date), 시가(Open), 고가(High), 저가(Low), 종가(Close), 거래량(Volume)을 포함합니다.
+긴 기간은 요약 통계와 함께 과거 구간을 주봉/월봉으로 줄이고, 최근 구간은 일봉 그대로 제공합니다.
+
+--- 요약 통계 ---
+{stats_text}
+{older_section}
+--- 최근 일봉 데이터 ({recent.index[0]:%Y-%m-%d} ~ {recent.index[-1]:%Y-%m-%d}) ---
+{recent_text}
+--- 주가 데이터 끝 ---
+당신의 이름은 David입니다.
+위의 실제 데이터에 기반하여 아래 질문에 데이터 분석가처럼 상세하게 답해주세요.
+단, 답변은 한국어로 해주세요.
+
+질문: {question}
+"""
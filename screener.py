@@ -0,0 +1,268 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import metrics, timed
+
+# 종목 목록 파일 위치 (universes/<이름>.txt, 한 줄에 종목 코드 하나, '#'으로 시작하는 줄은 주석)
+UNIVERSES_DIR = Path(__file__).parent / "universes"
+
+# 스크리닝 테이블 기본 위치 (STOCK_CACHE_DIR 환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.getenv("STOCK_CACHE_DIR", ".cache")
+
+# 스크리닝에 사용하는 컬럼 -> get_info 필드. 전체 info 대신 이 필드만 테이블에 남깁니다.
+TEXT_FIELDS = {
+    "name": "shortName",
+    "sector": "sector",
+    "currency": "currency",
+}
+NUMERIC_FIELDS = {
+    "price": "currentPrice",
+    "per": "trailingPE",
+    "forward_per": "forwardPE",
+    "pbr": "priceToBook",
+    "roe": "returnOnEquity",
+    "dividend_yield": "dividendYield",
+    "target_price": "targetMeanPrice",
+    "market_cap": "marketCap",
+}
+
+# 화면 표시용 컬럼 이름
+COLUMN_LABELS = {
+    "symbol": "종목",
+    "name": "기업명",
+    "sector": "섹터",
+    "currency": "통화",
+    "price": "현재가",
+    "per": "PER",
+    "forward_per": "PER (Forward)",
+    "pbr": "PBR",
+    "roe": "ROE",
+    "dividend_yield": "배당률",
+    "target_price": "목표 주가",
+    "upside": "목표가 상승여력",
+    "market_cap": "시가총액",
+    "fetched_at": "수집 시각",
+}
+
+
+def load_universe(name: str) -> list[str]:
+    """universes/<name>.txt에서 종목 코드 목록을 읽습니다. (중복 제거, 순서 유지)"""
+    lines = (UNIVERSES_DIR / f"{name}.txt").read_text(encoding="utf-8").splitlines()
+    return list(dict.fromkeys(line.strip().upper() for line in lines if line.strip() and not line.startswith("#")))
+
+
+def available_universes() -> list[str]:
+    return sorted(path.stem for path in UNIVERSES_DIR.glob("*.txt"))
+
+
+def _to_float(value) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+def project_info(symbol: str, info: dict) -> dict:
+    """get_info 결과에서 스크리닝에 필요한 필드만 뽑아 한 행으로 만듭니다."""
+    row = {"symbol": symbol}
+    row.update({column: info.get(field) or "" for column, field in TEXT_FIELDS.items()})
+    row.update({column: _to_float(info.get(field)) for column, field in NUMERIC_FIELDS.items()})
+    row["fetched_at"] = pd.Timestamp.now()
+    return row
+
+
+def build_table(rows: list[dict]) -> pd.DataFrame:
+    """
+    행 목록을 컬럼형 테이블로 만듭니다.
+    비율 지표는 float32, 반복되는 섹터/통화는 category로 저장해 메모리를 줄이고,
+    목표가 상승여력(upside)은 현재가와 목표 주가로부터 한 번에 계산합니다.
+    """
+    table = pd.DataFrame(rows, columns=["symbol", *TEXT_FIELDS, *NUMERIC_FIELDS, "fetched_at"])
+    for column in NUMERIC_FIELDS:
+        table[column] = table[column].astype("float64" if column == "market_cap" else "float32")
+    table["upside"] = (table["target_price"] / table["price"] - 1).astype("float32")
+    for column in ("sector", "currency"):
+        table[column] = table[column].astype("category")
+    table["fetched_at"] = pd.to_datetime(table["fetched_at"])
+    return table.set_index("symbol")
+
+
+@timed("screener.screen")
+def screen(table: pd.DataFrame, ranges: dict[str, tuple[float | None, float | None]] | None = None,
+           sectors: list[str] | None = None, sort_by: str | None = None, ascending: bool = False,
+           limit: int | None = None) -> pd.DataFrame:
+    """
+    스크리닝 테이블을 벡터 연산으로 필터링/정렬합니다.
+
+    ranges: {컬럼: (최소값, 최대값)} - None인 경계는 무시하며, 값이 없는(NaN) 종목은 제외됩니다.
+    sectors: 포함할 섹터 목록 (None이면 전체)
+    """
+    mask = np.ones(len(table), dtype=bool)
+    for column, (low, high) in (ranges or {}).items():
+        values = table[column].to_numpy()
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    if sectors:
+        mask &= table["sector"].isin(sectors).to_numpy()
+
+    result = table.loc[mask]
+    if sort_by:
+        result = result.sort_values(sort_by, ascending=ascending, na_position="last")
+    return result.head(limit) if limit else result
+
+
+class UniverseScreener:
+    """
+    종목 목록(universe) 전체의 기업 정보를 백그라운드에서 동시에 수집해 스크리닝 테이블을 만듭니다.
+
+    - 수집 결과는 필요한 필드만 남긴 테이블로 `checkpoint_every`건마다 디스크(Parquet)에 저장합니다.
+    - 다시 시작하면 `max_age`초 이내에 수집된 종목은 건너뛰고 나머지만 이어서 수집합니다.
+    - 외부 호출은 데이터 관리자의 yfinance 관문(호출 속도 제한, 429 재시도)을 거칩니다.
+    """
+
+    def __init__(self, data_manager, name: str, symbols: list[str] | None = None, root: str | None = None,
+                 max_workers: int = 8, checkpoint_every: int = 25, max_age: float = 86400):
+        self.data_manager = data_manager
+        self.name = name
+        self.symbols = list(dict.fromkeys(symbols)) if symbols else load_universe(name)
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+        self.max_age = max_age
+        self.path = Path(root or DEFAULT_CACHE_DIR) / "screener" / f"{name}.parquet"
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._failed: set[str] = set()
+        self._pending = 0
+        self._table = self._load()
+
+    # --- 테이블 저장/복원 ---
+
+    def _load(self) -> pd.DataFrame:
+        if self.path.exists():
+            try:
+                try:
+                    return pd.read_parquet(self.path)
+                except ImportError:
+                    return pd.read_pickle(self.path)
+            except Exception as e:
+                print(f"스크리닝 테이블 읽기 실패 ({self.name}): {e}")
+        return build_table([])
+
+    def _save(self, table: pd.DataFrame):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            table.to_parquet(tmp_path)
+        except ImportError:
+            table.to_pickle(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def _checkpoint(self, rows: list[dict]):
+        if not rows:
+            return
+        with self._lock:
+            new = build_table(rows)
+            table = pd.concat([self._table.drop(new.index, errors="ignore"), new])
+            # concat 후 달라진 category 범주를 다시 맞춥니다.
+            for column in ("sector", "currency"):
+                table[column] = table[column].astype(str).astype("category")
+            self._table = table
+        try:
+            self._save(table)
+        except OSError as e:
+            print(f"스크리닝 테이블 저장 실패 ({self.name}): {e}")
+
+    # --- 수집 ---
+
+    def _stale_symbols(self) -> list[str]:
+        """아직 수집하지 않았거나 `max_age`보다 오래된 종목"""
+        with self._lock:
+            fetched_at = self._table["fetched_at"]
+        cutoff = pd.Timestamp.now() - pd.Timedelta(seconds=self.max_age)
+        fresh = set(fetched_at.index[fetched_at >= cutoff])
+        return [s for s in self.symbols if s not in fresh]
+
+    def _run(self, symbols: list[str]):
+        started = time.perf_counter()
+        rows: list[dict] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.data_manager.fetch_info, s): s for s in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                info = future.result()
+                with self._lock:
+                    self._pending -= 1
+                    if info:
+                        self._failed.discard(symbol)
+                    else:
+                        self._failed.add(symbol)
+                if info:
+                    rows.append(project_info(symbol, info))
+                if len(rows) >= self.checkpoint_every:
+                    self._checkpoint(rows)
+                    rows = []
+                if self._stop.is_set():
+                    # 아직 시작하지 않은 조회는 취소하고, 받은 결과까지만 저장합니다.
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        self._checkpoint(rows)
+        with self._lock:
+            self._pending = 0
+        metrics.observe("screener.collect", time.perf_counter() - started)
+
+    def start(self, refresh: bool = False) -> bool:
+        """
+        백그라운드 수집을 시작(또는 이어서 재개)합니다. 이미 실행 중이거나 수집할 종목이 없으면 False를 반환합니다.
+        refresh=True이면 최근에 수집한 종목도 다시 수집합니다.
+        """
+        symbols = self.symbols if refresh else self._stale_symbols()
+        if not symbols:
+            return False
+        # 실행 여부 확인과 시작을 한 번에 잠가, 여러 세션이 동시에 눌러도 수집은 하나만 시작합니다.
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._pending = len(symbols)
+            self._thread = threading.Thread(target=self._run, args=(symbols,), daemon=True, name=f"screener-{self.name}")
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """진행 중인 수집을 멈춥니다. 이미 받은 결과는 저장되며, 다음 start()에서 이어서 수집합니다."""
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def progress(self) -> dict:
+        """전체/수집 완료/실패/남은 종목 수와 실행 여부를 반환합니다."""
+        with self._lock:
+            collected = int(self._table.index.isin(self.symbols).sum())
+            return {
+                "total": len(self.symbols),
+                "collected": collected,
+                "failed": len(self._failed),
+                "pending": self._pending if self.running else 0,
+                "running": self.running,
+            }
+
+    def table(self) -> pd.DataFrame:
+        """현재까지 수집된 스크리닝 테이블 (이 종목 목록에 속한 종목만)"""
+        with self._lock:
+            table = self._table
+        return table.loc[table.index.isin(self.symbols)]
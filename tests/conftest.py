@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈이 저장소 최상위에 있으므로, 어디서 pytest를 실행해도 임포트할 수 있게 경로를 추가합니다.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+from backtest import run_backtest, sweep
+
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    index = pd.bdate_range("2015-01-01", periods=800, name="Date")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(7).normal(0.0003, 0.012, len(index))))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+GRID = {"fast": list(range(5, 51, 5)), "slow": list(range(20, 201, 10))}
+
+
+def test_default_sweep_stays_in_process(prices, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("작은 탐색에서 프로세스 풀을 띄웠습니다.")
+
+    monkeypatch.setattr(backtest, "ProcessPoolExecutor", no_pool)
+    result = sweep(prices, "ma_crossover", GRID, max_workers=8)
+    assert len(result) == sum(f < s for f in GRID["fast"] for s in GRID["slow"])
+
+
+def test_pool_and_inline_paths_return_same_table(prices, monkeypatch):
+    inline = sweep(prices, "ma_crossover", GRID, max_workers=1)
+    # 작업량 기준을 낮춰 작은 탐색도 프로세스 풀(spawn)로 계산하게 합니다.
+    monkeypatch.setattr(backtest, "PARALLEL_WORK_PER_WORKER", 1)
+    pooled = sweep(prices, "ma_crossover", GRID, max_workers=2)
+    pd.testing.assert_frame_equal(inline, pooled)
+
+
+def test_sweep_matches_single_backtest(prices):
+    result = sweep(prices, "rsi_threshold", {"lower": [25, 30], "upper": [70]}, max_workers=1)
+    row = result.set_index("lower").loc[30]
+    single = run_backtest(prices, "rsi_threshold", lower=30, upper=70).metrics
+    assert row["total_return"] == pytest.approx(single["total_return"])
+    assert row["max_drawdown"] == pytest.approx(single["max_drawdown"])
@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+
+import cache_backend
+from cache_backend import MISSING, FakeRedis, MemoryLRUCache, RedisCache, cached_method
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(cache_backend.time, "time", lambda: now[0])
+    return now
+
+
+# --- MemoryLRUCache ---
+
+def test_memory_cache_expires_after_ttl(clock):
+    cache = MemoryLRUCache(default_ttl=60)
+    cache.set("short", 1, ttl=10)
+    cache.set("default", 2)
+
+    clock[0] += 11
+    assert cache.get("short") is MISSING
+    assert cache.get("default") == 2
+    clock[0] += 50
+    assert cache.get("default") is MISSING
+    assert cache.stats.expirations == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryLRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_memory_cache_stores_none_as_value():
+    cache = MemoryLRUCache()
+    cache.set("none", None)
+    assert cache.get("none") is None
+    assert cache.stats.as_dict()["hits"] == 1
+
+
+# --- RedisCache + FakeRedis ---
+
+def test_redis_cache_round_trips_pickled_values():
+    cache = RedisCache(client=FakeRedis())
+    df = pd.DataFrame({"Close": [1.0, 2.0]})
+    cache.set("prices", (df, "2024-01-02"))
+
+    cached_df, adjusted_end = cache.get("prices")
+    pd.testing.assert_frame_equal(cached_df, df)
+    assert adjusted_end == "2024-01-02"
+    assert cache.get("other") is MISSING
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_redis_cache_expires_with_server_ttl(clock):
+    cache = RedisCache(client=FakeRedis(), default_ttl=60)
+    cache.set("info", {"symbol": "AAPL"})
+    cache.set("forever", 1, ttl=0)
+
+    clock[0] += 61
+    assert cache.get("info") is MISSING
+    assert cache.get("forever") == 1
+
+
+def test_redis_cache_clear_only_removes_own_prefix():
+    client = FakeRedis()
+    ours = RedisCache(client=client, prefix="app:")
+    theirs = RedisCache(client=client, prefix="other:")
+    ours.set("a", 1)
+    ours.set("b", 2)
+    theirs.set("a", 3)
+
+    ours.clear()
+    assert ours.get("a") is MISSING
+    assert ours.get("b") is MISSING
+    assert theirs.get("a") == 3
+
+
+def test_replicas_share_one_redis():
+    client = FakeRedis()
+    RedisCache(client=client).set("key", "value")
+    assert RedisCache(client=client).get("key") == "value"
+
+
+# --- cached_method ---
+
+class Service:
+    def __init__(self, cache):
+        self.cache = cache
+        self.calls = 0
+
+    @cached_method(ttl=60)
+    def lookup(self, symbol: str, period: str = "1d"):
+        self.calls += 1
+        return None if symbol == "MISSING" else f"{symbol}:{period}"
+
+
+@pytest.mark.parametrize("make_cache", [MemoryLRUCache, lambda: RedisCache(client=FakeRedis())])
+def test_cached_method_normalises_arguments(make_cache):
+    service = Service(make_cache())
+    assert service.lookup("AAPL") == "AAPL:1d"
+    assert service.lookup("AAPL", period="1d") == "AAPL:1d"
+    assert service.lookup(symbol="AAPL") == "AAPL:1d"
+    assert service.calls == 1
+    service.lookup("AAPL", "5d")
+    assert service.calls == 2
+
+
+def test_cached_method_does_not_cache_failures():
+    service = Service(MemoryLRUCache())
+    assert service.lookup("MISSING") is None
+    assert service.lookup("MISSING") is None
+    assert service.calls == 2
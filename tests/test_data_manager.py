@@ -0,0 +1,40 @@
+import pandas as pd
+
+from data_manager import YahooFinanceDataManager
+from price_store import PriceStore
+
+TODAY = pd.Timestamp.today().normalize()
+
+
+def business_day_fetcher(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """주말을 뺀 일봉을 돌려주는 대체 fetcher"""
+    index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+    return pd.DataFrame({"Close": 1.0, "Volume": 1.0}, index=index)
+
+
+def daily_fetcher(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """오늘 봉까지 매일 봉이 있는 대체 fetcher"""
+    index = pd.date_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), freq="D")
+    return pd.DataFrame({"Close": 1.0, "Volume": 1.0}, index=index)
+
+
+def test_end_on_holiday_resolves_to_previous_session(tmp_path):
+    manager = YahooFinanceDataManager(price_store=PriceStore(root=str(tmp_path), fetcher=business_day_fetcher))
+    # 2024-01-08(월)의 직전 거래일은 2024-01-05(금)입니다.
+    df, adjusted_end = manager.get_price_data_adjusted("X", "2023-12-01", "2024-01-08")
+    assert adjusted_end == "2024-01-05"
+    assert df.index[0] == pd.Timestamp("2023-12-01") and df.index[-1] == pd.Timestamp("2024-01-05")
+
+
+def test_today_bar_counts_as_last_session(tmp_path):
+    # 오늘 봉은 저장소에 기록되지 않지만, 반환된 봉에 있으면 조정된 종료일이 됩니다.
+    manager = YahooFinanceDataManager(price_store=PriceStore(root=str(tmp_path), fetcher=daily_fetcher))
+    end = (TODAY + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    df, adjusted_end = manager.get_price_data_adjusted("X", (TODAY - pd.Timedelta(days=10)).strftime("%Y-%m-%d"), end)
+    assert adjusted_end == TODAY.strftime("%Y-%m-%d")
+    assert df.index[-1] == TODAY
+
+
+def test_unknown_symbol_returns_none(tmp_path):
+    manager = YahooFinanceDataManager(price_store=PriceStore(root=str(tmp_path), fetcher=lambda *_: pd.DataFrame()))
+    assert manager.get_price_data_adjusted("NOPE", "2024-01-01", "2024-02-01") == (None, None)
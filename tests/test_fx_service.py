@@ -0,0 +1,165 @@
+import json
+import threading
+
+import pytest
+
+import fx_service
+from fx_service import DEFAULT_USD_KRW_RATE, FAILURE_BACKOFF, FXRateService
+
+
+class StubResponse:
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """AlphaVantage 대체 세션입니다. 호출 수를 세고, `gate`가 열릴 때까지 응답을 미룰 수 있습니다."""
+
+    def __init__(self, rate: float = 1300.0):
+        self.rate = rate
+        self.calls = 0
+        self.history_calls = 0
+        self.fail = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def get(self, url, params=None, timeout=None):
+        if params["function"] == "FX_DAILY":
+            self.history_calls += 1
+            if self.fail:
+                raise ConnectionError("boom")
+            return StubResponse({"Time Series FX (Daily)": {"2024-01-02": {"4. close": "1300.0"}}})
+        self.calls += 1
+        self.entered.set()
+        self.gate.wait(timeout=5)
+        if self.fail:
+            raise ConnectionError("boom")
+        return StubResponse({"Realtime Currency Exchange Rate": {"5. Exchange Rate": str(self.rate)}})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [50.0]
+    monkeypatch.setattr(fx_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def session():
+    return StubSession()
+
+
+@pytest.fixture
+def service(tmp_path, session):
+    return FXRateService(ttl=600, cache_dir=str(tmp_path), session=session)
+
+
+def _wait_refresh(service: FXRateService):
+    """백그라운드 갱신이 끝날 때까지 기다립니다."""
+    done = service._inflight
+    if done is not None:
+        assert done.wait(timeout=5)
+
+
+def test_cold_callers_share_one_request(service, session, clock):
+    session.gate.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get_usd_krw_rate())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    assert session.entered.wait(timeout=5)
+    session.gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == [1300.0] * 5
+    assert session.calls == 1
+
+
+def test_fresh_rate_is_served_from_memory(service, session, clock):
+    assert service.get_usd_krw_rate() == 1300.0
+    clock[0] += 599
+    assert service.get_usd_krw_rate() == 1300.0
+    assert session.calls == 1
+
+
+def test_stale_rate_is_returned_while_one_refresh_runs(service, session, clock):
+    service.get_usd_krw_rate()
+    clock[0] += 601
+    session.rate = 1400.0
+    session.gate.clear()
+
+    # 만료된 값을 바로 돌려주고, 갱신 중에 들어온 요청은 새 호출을 만들지 않습니다.
+    assert service.get_usd_krw_rate() == 1300.0
+    assert service.get_usd_krw_rate() == 1300.0
+    session.gate.set()
+    _wait_refresh(service)
+
+    assert session.calls == 2
+    assert service.get_usd_krw_rate() == 1400.0
+
+
+def test_cold_failure_backs_off(service, session, clock):
+    session.fail = True
+    assert service.get_usd_krw_rate() == DEFAULT_USD_KRW_RATE
+    clock[0] += FAILURE_BACKOFF - 1
+    assert service.get_usd_krw_rate() == DEFAULT_USD_KRW_RATE
+    assert session.calls == 1
+
+    session.fail = False
+    clock[0] += 1
+    assert service.get_usd_krw_rate() == 1300.0
+    assert session.calls == 2
+
+
+def test_stale_failure_keeps_last_rate_and_backs_off(service, session, clock):
+    service.get_usd_krw_rate()
+    clock[0] += 601
+    session.fail = True
+    assert service.get_usd_krw_rate() == 1300.0
+    _wait_refresh(service)
+
+    clock[0] += FAILURE_BACKOFF - 1
+    assert service.get_usd_krw_rate() == 1300.0
+    assert service._inflight is None
+    assert session.calls == 2
+
+    session.fail = False
+    session.rate = 1400.0
+    clock[0] += 1
+    service.get_usd_krw_rate()
+    _wait_refresh(service)
+    assert session.calls == 3
+    assert service.get_usd_krw_rate() == 1400.0
+
+
+def test_rate_loaded_from_disk_is_stale(tmp_path, session, clock):
+    # 호스트 가동 시간(monotonic)이 ttl보다 짧아도 디스크에서 읽은 환율은 갱신 대상입니다.
+    (tmp_path / "fx_usd_krw.json").write_text(json.dumps({"rate": 1200.0, "fetched_at": 0}))
+    service = FXRateService(ttl=600, cache_dir=str(tmp_path), session=session)
+
+    assert service.get_usd_krw_rate() == 1200.0
+    _wait_refresh(service)
+    assert session.calls == 1
+    assert service.get_usd_krw_rate() == 1300.0
+
+
+def test_history_failure_backs_off(service, session, clock):
+    session.fail = True
+    assert service.get_usd_krw_history() is None
+    clock[0] += FAILURE_BACKOFF - 1
+    assert service.get_usd_krw_history() is None
+    assert session.history_calls == 1
+
+    session.fail = False
+    clock[0] += 1
+    history = service.get_usd_krw_history()
+    assert history.iloc[-1] == 1300.0
+    assert session.history_calls == 2
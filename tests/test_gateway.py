@@ -0,0 +1,188 @@
+import threading
+import time
+
+import pytest
+
+from bench.fakes import ThrottlingEndpoint, YFRateLimitError
+from gateway import OutboundGateway, SingleFlight, TokenBucket, is_throttling_error
+from instrumentation import metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _wait_for_counter(name: str, expected: float, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while metrics.counters().get(name, 0) < expected:
+        if time.monotonic() > deadline:
+            pytest.fail(f"{name}가 {expected}에 도달하지 않았습니다.")
+        time.sleep(0.01)
+
+
+# --- TokenBucket ---
+
+def test_token_bucket_allows_burst_then_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_pause_blocks_even_with_tokens():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0, capacity=1, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    bucket.pause(3)
+    assert bucket.acquire() == pytest.approx(3)
+    assert bucket.acquire() == 0
+
+
+# --- SingleFlight ---
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight("test_single_flight")
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    _wait_for_counter('coalesced_requests_total{service="test_single_flight"}', 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["value"] * 5
+    # 끝난 호출은 저장하지 않으므로 같은 키라도 다시 실행합니다.
+    release.set()
+    flight.do("key", slow)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_leader_exception():
+    flight = SingleFlight("test_single_flight_error")
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for_counter('coalesced_requests_total{service="test_single_flight_error"}', 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+
+
+# --- OutboundGateway + ThrottlingEndpoint ---
+
+def test_gateway_retries_throttled_calls_until_endpoint_allows():
+    clock = FakeClock()
+    gateway = OutboundGateway("test_retry", rate=0, max_retries=4, sleep=clock.sleep)
+    responses = iter([YFRateLimitError(), YFRateLimitError(), "ok"])
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert gateway.call("key", call) == "ok"
+    assert len(attempts) == 3
+    assert metrics.counters()['retries_total{service="test_retry"}'] == 2
+    # 재시도 대기(full jitter)는 0 ~ base * 2^attempt 범위입니다.
+    assert all(0 <= s <= gateway.base_delay * 2 ** i for i, s in enumerate(clock.sleeps))
+
+
+def test_gateway_gives_up_after_max_retries():
+    endpoint = ThrottlingEndpoint(limit=0) # 모든 호출을 429로 거절
+    clock = FakeClock()
+    gateway = OutboundGateway("test_give_up", rate=0, max_retries=3, sleep=clock.sleep)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        endpoint.check()
+
+    with pytest.raises(YFRateLimitError) as exc_info:
+        gateway.call("key", call)
+    assert is_throttling_error(exc_info.value)
+    assert len(attempts) == 4
+    assert metrics.counters()['retries_total{service="test_give_up"}'] == 3
+
+
+def test_gateway_does_not_retry_other_errors():
+    gateway = OutboundGateway("test_no_retry", rate=0, sleep=lambda s: None)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        gateway.call("key", call)
+    assert len(attempts) == 1
+
+
+def test_gateway_coalesces_identical_requests_against_endpoint():
+    endpoint = ThrottlingEndpoint(limit=1)
+    gateway = OutboundGateway("test_coalesce", rate=0, max_retries=0)
+    release = threading.Event()
+    attempts = []
+
+    def download(symbol):
+        attempts.append(symbol)
+        endpoint.check()
+        release.wait(5)
+        return f"bars:{symbol}"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(gateway.call(("download", "AAPL"), download, "AAPL")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_for_counter('coalesced_requests_total{service="test_coalesce"}', 7)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # 한도가 초당 1회여도 같은 요청 8건은 실제 호출 1번으로 끝나 429가 나지 않습니다.
+    assert attempts == ["AAPL"]
+    assert results == ["bars:AAPL"] * 8
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from bench.fakes import FakeServices
+from live_feed import LiveFeedHub, LiveQuoteStream, SimulatedQuoteFeed, is_market_open
+
+
+def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("조건이 시간 안에 충족되지 않았습니다.")
+        time.sleep(0.01)
+
+
+def _fetch(feed, symbol: str, since=None) -> pd.DataFrame:
+    return asyncio.run(feed.fetch_bars(symbol, since))
+
+
+def test_fake_feed_adds_bars_per_poll():
+    services = FakeServices(latency_scale=0)
+    feed = services.quote_feed(bars_per_poll=2, start="2024-01-02 09:30")
+
+    first = _fetch(feed, "AAPL")
+    second = _fetch(feed, "AAPL", since=first.index[-1])
+    assert len(first) == 30
+    # since 이후(마지막 봉 포함)만 돌려줍니다.
+    assert list(second.index) == list(pd.date_range("2024-01-02 09:59", periods=3, freq="min"))
+    assert services.calls.counts["quote_feed"] == 2
+
+
+def test_stream_append_bumps_version_only_on_change():
+    feed = SimulatedQuoteFeed(start="2024-01-02 09:30")
+    stream = LiveQuoteStream("AAPL", feed)
+    bars = _fetch(feed, "AAPL")
+
+    assert stream._append(bars)
+    assert stream.version == 1
+    assert not stream._append(bars.iloc[-5:])
+    assert stream.version == 1
+
+    # 진행 중인 마지막 봉이 바뀌면 교체하고, 새 봉은 이어 붙입니다.
+    updated = bars.iloc[-1:].copy()
+    updated["Close"] += 1
+    assert stream._append(updated)
+    assert stream._append(_fetch(feed, "AAPL", since=bars.index[-1]))
+    version, snapshot = stream.snapshot()
+    assert version == 3
+    assert len(snapshot) == 31
+    assert snapshot.index.is_monotonic_increasing
+
+
+def test_daily_bar_aggregates_latest_session():
+    feed = SimulatedQuoteFeed(start="2024-01-02 09:30")
+    stream = LiveQuoteStream("AAPL", feed)
+    bars = _fetch(feed, "AAPL")
+    stream._append(bars)
+
+    daily = stream.daily_bar()
+    assert list(daily.index) == [pd.Timestamp("2024-01-02")]
+    row = daily.iloc[0]
+    assert row["Open"] == bars["Open"].iloc[0]
+    assert row["Close"] == bars["Close"].iloc[-1]
+    assert row["High"] == bars["High"].max()
+    assert row["Low"] == bars["Low"].min()
+    assert row["Volume"] == bars["Volume"].sum()
+
+
+def test_hub_shares_one_stream_and_polls_in_background():
+    services = FakeServices(latency_scale=0)
+    hub = LiveFeedHub(services.quote_feed(), market_clock=lambda symbol: True, min_interval=0.01)
+    try:
+        stream = hub.subscribe("AAPL")
+        assert hub.subscribe("AAPL") is stream
+        _wait_until(lambda: stream.version >= 3)
+        _, bars = stream.snapshot()
+        assert len(bars) >= 32
+        assert stream.status == "live"
+    finally:
+        hub.stop_all()
+    _wait_until(lambda: not stream.running)
+
+
+def test_stream_backs_off_when_nothing_changes():
+    class StaticFeed:
+        def __init__(self):
+            self.bars = _fetch(SimulatedQuoteFeed(start="2024-01-02 09:30"), "AAPL")
+
+        async def fetch_bars(self, symbol, since=None):
+            return self.bars
+
+    hub = LiveFeedHub(StaticFeed(), market_clock=lambda symbol: True, min_interval=0.01, max_interval=0.04)
+    try:
+        stream = hub.subscribe("AAPL")
+        _wait_until(lambda: stream.interval == 0.04)
+        assert stream.version == 1
+    finally:
+        hub.stop_all()
+
+
+def test_market_hours_follow_exchange_timezone():
+    # 2024-01-02 15:00 UTC = 뉴욕 10:00 (장중) / 서울 자정 (장외)
+    now = pd.Timestamp("2024-01-02 15:00", tz="UTC")
+    assert is_market_open("AAPL", now)
+    assert not is_market_open("005930.KS", now)
+    assert not is_market_open("AAPL", pd.Timestamp("2024-01-06 15:00", tz="UTC")) # 토요일
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import llm_service
+from llm_service import OpenAIService, ResponseCache, fingerprint_dataframe
+
+
+class StubClient:
+    """chat.completions.create 호출 수를 세고 고정 답변을 돌려주는 OpenAI 클라이언트 대체 객체"""
+
+    def __init__(self, answer: str = "답변"):
+        self.answer = answer
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, stream: bool = False, **_):
+        self.calls += 1
+        if stream:
+            delta = SimpleNamespace(content=self.answer)
+            return iter([SimpleNamespace(choices=[SimpleNamespace(delta=delta)])])
+        message = SimpleNamespace(content=f" {self.answer} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cached_answer_skips_api_call():
+    client = StubClient()
+    service = OpenAIService(client=client, cache=ResponseCache())
+
+    assert service.get_qa_response("질문") == "답변"
+    # 공백/줄바꿈만 다른 프롬프트는 같은 질문입니다.
+    assert service.get_qa_response("  질문\n") == "답변"
+    assert client.calls == 1
+
+
+def test_key_includes_data_fingerprint_and_parameters():
+    client = StubClient()
+    service = OpenAIService(client=client, cache=ResponseCache())
+    df = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+
+    service.get_qa_response("질문", data_fingerprint=fingerprint_dataframe(df))
+    service.get_qa_response("질문", data_fingerprint=fingerprint_dataframe(df.assign(Close=[1.0, 3.0])))
+    service.get_qa_response("질문", temperature=0.9)
+    assert client.calls == 3
+
+
+def test_stream_caches_only_completed_answer():
+    client = StubClient()
+    service = OpenAIService(client=client, cache=ResponseCache())
+
+    stream = service.stream_qa_response("질문")
+    next(stream)
+    stream.close() # 중간에 멈춘 스트림은 저장하지 않습니다.
+    assert len(service.cache) == 0
+
+    assert "".join(service.stream_qa_response("질문")) == "답변"
+    assert "".join(service.stream_qa_response("질문")) == "답변"
+    assert client.calls == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    client = StubClient()
+    service = OpenAIService(client=client, cache=ResponseCache(ttl=60))
+
+    service.get_qa_response("질문")
+    clock[0] += 59
+    service.get_qa_response("질문")
+    assert client.calls == 1
+
+    clock[0] += 2
+    service.get_qa_response("질문")
+    assert client.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A" # a를 최근 사용으로 갱신
+    cache.put("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
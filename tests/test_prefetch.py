@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+import prefetch
+from prefetch import Prefetcher
+
+
+class StubDataManager:
+    """get_info가 처음 `failures`번은 None(일시적 429 등)을 돌려주는 데이터 관리자"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.info_calls = 0
+        self.price_calls = 0
+        self._lock = threading.Lock()
+
+    def get_info(self, symbol):
+        with self._lock:
+            self.info_calls += 1
+            if self.info_calls <= self.failures:
+                return None
+        return {"symbol": symbol, "longBusinessSummary": "Makes things."}
+
+    def get_price_data_adjusted(self, symbol, start, end):
+        with self._lock:
+            self.price_calls += 1
+        return "bars", end
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(prefetch, "get_today_usd_to_krw_rate", lambda: 1350.0)
+    monkeypatch.setattr(prefetch, "translate_to_korean", lambda text: f"번역:{text}")
+
+
+def test_snapshot_is_reused_within_ttl():
+    manager = StubDataManager()
+    prefetcher = Prefetcher(manager)
+    snapshot = prefetcher.prefetch("AAPL")
+    prefetcher.wait()
+
+    assert prefetcher.prefetch("AAPL") is snapshot
+    assert snapshot.get("summary_ko") == "번역:Makes things."
+    assert snapshot.get("price") == ("bars", snapshot.price_window[1])
+    assert (manager.info_calls, manager.price_calls) == (1, 1)
+
+
+def test_failed_items_are_refetched_on_next_prefetch():
+    manager = StubDataManager(failures=1)
+    prefetcher = Prefetcher(manager)
+    snapshot = prefetcher.prefetch("AAPL")
+    prefetcher.wait()
+    assert snapshot.get("info") is None
+    assert snapshot.failed() == ["info"]
+
+    # 다음 세션/재실행의 prefetch는 실패한 항목(과 그에 이어지는 번역)만 다시 조회합니다.
+    assert prefetcher.prefetch("AAPL") is snapshot
+    prefetcher.wait()
+    assert snapshot.get("info")["symbol"] == "AAPL"
+    assert snapshot.get("summary_ko") == "번역:Makes things."
+    assert (manager.info_calls, manager.price_calls) == (2, 1)
+    assert snapshot.failed() == []
+
+
+def test_failed_price_is_refetched():
+    class FailingPrice(StubDataManager):
+        def get_price_data_adjusted(self, symbol, start, end):
+            super().get_price_data_adjusted(symbol, start, end)
+            if self.price_calls == 1:
+                raise RuntimeError("429")
+            return "bars", end
+
+    manager = FailingPrice()
+    prefetcher = Prefetcher(manager)
+    snapshot = prefetcher.prefetch("AAPL")
+    prefetcher.wait()
+    assert snapshot.get("price") is None
+
+    prefetcher.prefetch("AAPL")
+    prefetcher.wait()
+    assert snapshot.get("price") is not None
+    assert (manager.info_calls, manager.price_calls) == (1, 2)
@@ -0,0 +1,141 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import gateway
+from gateway import OutboundGateway
+from price_store import PriceStore
+
+TODAY = pd.Timestamp.today().normalize()
+
+
+def _day(offset: int) -> str:
+    return (TODAY + pd.Timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+class FakeFetcher:
+    """날짜에서 종가가 정해지는 일봉을 돌려주고 호출 구간을 기록합니다. (`scale`로 수정주가 변경 흉내)"""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+        self.scale = 1.0
+        self.today_bump = 0.0
+        self.empty = False
+
+    def __call__(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        self.calls.append((start, end))
+        if self.empty:
+            return pd.DataFrame()
+        index = pd.date_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), freq="D")
+        close = np.asarray((index - pd.Timestamp("2000-01-01")).days, dtype=float) * self.scale
+        df = pd.DataFrame({"Close": close, "Volume": 1.0}, index=index)
+        if TODAY in df.index:
+            df.loc[TODAY, "Close"] += self.today_bump
+        return df
+
+
+@pytest.fixture
+def fetcher():
+    return FakeFetcher()
+
+
+@pytest.fixture
+def store(tmp_path, fetcher):
+    return PriceStore(root=str(tmp_path), fetcher=fetcher)
+
+
+def _meta(store: PriceStore, symbol: str = "X") -> dict:
+    return store._load(symbol)[1]
+
+
+def test_unknown_symbol_returns_empty_without_error(store, fetcher, capsys):
+    fetcher.empty = True
+    assert store.get("NOPE", _day(-30), _day(1)).empty
+    assert store._load("NOPE") == (None, None)
+    assert "읽기 실패" not in capsys.readouterr().out
+
+
+def test_stored_range_is_served_without_fetching(store, fetcher):
+    store.get("X", _day(-60), _day(-30))
+    fetcher.calls.clear()
+    result = store.get("X", _day(-50), _day(-40))
+    assert fetcher.calls == []
+    assert len(result) == 10
+
+
+def test_only_head_and_tail_gaps_are_fetched(store, fetcher):
+    store.get("X", _day(-60), _day(-30))
+    fetcher.calls.clear()
+
+    result = store.get("X", _day(-90), _day(-10))
+    # 앞 구간은 그대로, 뒤 구간은 마지막 저장 봉 하나를 겹쳐 받습니다.
+    assert fetcher.calls == [(_day(-90), _day(-60)), (_day(-31), _day(-10))]
+    assert len(result) == 80
+    assert result.index.is_monotonic_increasing and result.index.is_unique
+    assert _meta(store) == {"covered_start": _day(-90), "covered_end": _day(-10)}
+
+
+def test_today_bar_is_returned_but_not_persisted(store, fetcher):
+    result = store.get("X", _day(-10), _day(1))
+    assert result.index[-1] == TODAY
+    bars, meta = store._load("X")
+    assert bars.index[-1] < TODAY
+    assert meta["covered_end"] == _day(0)
+
+    # 장중 가격 변화는 수정주가 변경으로 보지 않습니다. (전체 재조회 없음)
+    fetcher.today_bump = 5.0
+    fetcher.calls.clear()
+    result = store.get("X", _day(-5), _day(1))
+    assert fetcher.calls == [(_day(-1), _day(1))]
+    assert result.loc[TODAY, "Close"] == pytest.approx(float((TODAY - pd.Timestamp("2000-01-01")).days) + 5)
+
+
+def test_readjustment_refetches_whole_stored_range(store, fetcher):
+    store.get("X", _day(-100), _day(-20))
+    fetcher.scale = 0.5 # 배당/분할로 과거 수정주가 전체가 바뀜
+    fetcher.calls.clear()
+
+    result = store.get("X", _day(-30), _day(-10))
+    assert fetcher.calls[-1] == (_day(-100), _day(-10))
+    assert _meta(store) == {"covered_start": _day(-100), "covered_end": _day(-10)}
+    bars, _ = store._load("X")
+    expected = np.asarray((bars.index - pd.Timestamp("2000-01-01")).days, dtype=float) * 0.5
+    np.testing.assert_allclose(bars["Close"], expected)
+    assert len(result) == 20
+
+
+class YFRateLimitError(Exception):
+    """yfinance.exceptions.YFRateLimitError 대역"""
+
+
+def test_rate_limited_history_is_retried_through_gateway(tmp_path, monkeypatch):
+    calls = []
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, start=None, end=None, auto_adjust=True, **kwargs):
+            calls.append((self.symbol, start, end))
+            if len(calls) <= 2:
+                raise YFRateLimitError("Too Many Requests. Rate limited. Try after a while.")
+            index = pd.date_range(start, end, freq="D", inclusive="left", tz="America/New_York")
+            return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0,
+                                 "Dividends": 0.0, "Stock Splits": 0.0}, index=index)
+
+    yf = types.ModuleType("yfinance")
+    yf.Ticker = Ticker
+    yf.config = types.SimpleNamespace(network=types.SimpleNamespace(hide_exceptions=None))
+    monkeypatch.setitem(sys.modules, "yfinance", yf)
+    sleeps = []
+    monkeypatch.setitem(gateway._gateways, "yfinance",
+                        OutboundGateway("yfinance", rate=0, max_retries=4, sleep=sleeps.append))
+
+    result = PriceStore(root=str(tmp_path)).get("X", _day(-10), _day(-5))
+    assert len(calls) == 3 and len(sleeps) == 2
+    assert yf.config.network.hide_exceptions is False
+    assert list(result.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert len(result) == 5 and result.index.tz is None
@@ -0,0 +1,37 @@
+import threading
+
+from screener import UniverseScreener
+
+
+class BlockingDataManager:
+    """`gate`가 열릴 때까지 fetch_info를 붙잡아 두는 데이터 관리자"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def fetch_info(self, symbol):
+        self.gate.wait(timeout=5)
+        return {"symbol": symbol}
+
+
+def test_concurrent_start_runs_one_collector(tmp_path):
+    manager = BlockingDataManager()
+    screener = UniverseScreener(manager, "test", symbols=["A", "B", "C"], root=str(tmp_path))
+    barrier = threading.Barrier(8)
+    results = []
+
+    def press_start():
+        barrier.wait()
+        results.append(screener.start())
+
+    threads = [threading.Thread(target=press_start) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    collector = screener._thread
+    manager.gate.set()
+    collector.join(timeout=5)
+
+    assert results.count(True) == 1
+    assert not screener.running
@@ -0,0 +1,65 @@
+import pandas as pd
+
+import views
+from data_manager import YahooFinanceDataManager
+
+
+class StubSnapshot:
+    price_window = ("2024-01-01", "2024-01-08")
+
+    def __init__(self, price):
+        self.price = price
+
+    def get(self, name):
+        assert name == "price"
+        return self.price
+
+
+class StubDataManager:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def get_price_data_adjusted(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        return self.result
+
+    process_price_df = YahooFinanceDataManager.process_price_df
+
+
+def _bars() -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=3, name="Date")
+    return pd.DataFrame({"Open": 1.0, "Close": [1.0, 2.0, 3.0], "Extra": 0}, index=index)
+
+
+def test_load_price_history_uses_snapshot_for_default_window():
+    manager = StubDataManager((None, None))
+    snapshot = StubSnapshot((_bars(), "2024-01-04"))
+
+    price_df, adjusted_end = views.load_price_history(manager, "AAPL", *StubSnapshot.price_window, snapshot)
+    assert manager.calls == []
+    assert list(price_df.columns) == ["Close", "Open"]
+    assert adjusted_end == "2024-01-04"
+
+
+def test_load_price_history_fetches_other_windows():
+    manager = StubDataManager((_bars(), "2024-01-04"))
+    snapshot = StubSnapshot(None)
+
+    price_df, _ = views.load_price_history(manager, "AAPL", "2023-01-01", "2024-01-08", snapshot)
+    assert manager.calls == [("AAPL", "2023-01-01", "2024-01-08")]
+    assert len(price_df) == 3
+
+
+def test_load_price_history_reports_missing_data():
+    assert views.load_price_history(StubDataManager((None, None)), "AAPL", "2023-01-01", "2024-01-08") == (None, None)
+    # 스냅샷 조회가 실패(None)한 경우도 같은 결과입니다.
+    failed = StubSnapshot(None)
+    assert views.load_price_history(StubDataManager((None, None)), "AAPL", *failed.price_window, failed) == (None, None)
+
+
+def test_top_officers_handles_missing_info():
+    assert views.top_officers(None, 1350.0).empty
+    info = {"companyOfficers": [{"name": f"P{i}", "title": "T", "totalPay": i} for i in range(7)]}
+    table = views.top_officers(info, None)
+    assert list(table["이름"]) == ["P6", "P5", "P4", "P3", "P2"]
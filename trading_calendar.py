@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+class TradingCalendar:
+    """
+    실제 거래가 있었던 세션(날짜) 목록으로 만든 거래일 인덱스입니다.
+    정렬된 배열에 이진 탐색을 사용하므로 조회는 O(log n)입니다.
+    """
+
+    def __init__(self, sessions):
+        index = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+        self._sessions = index.values.astype("datetime64[ns]")
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def last_session_before(self, ts, inclusive: bool = False) -> pd.Timestamp | None:
+        """
+        `ts` 이전의 마지막 거래일을 반환합니다. (`inclusive=True`이면 `ts` 당일 포함)
+        해당하는 거래일이 없으면 None을 반환합니다.
+        """
+        if not len(self._sessions):
+            return None
+        target = np.datetime64(pd.Timestamp(ts).normalize(), "ns")
+        side = "right" if inclusive else "left"
+        pos = np.searchsorted(self._sessions, target, side=side) - 1
+        if pos < 0:
+            return None
+        return pd.Timestamp(self._sessions[pos])
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from import_profiler import lazy_import
+from instrumentation import metrics
+
+# GoogleTranslator의 요청당 최대 길이(5000자)보다 여유 있게 자릅니다.
+MAX_CHUNK_CHARS = 4500
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+class TranslationCache:
+    """
+    원문 내용의 해시를 키로 번역 결과를 디스크(SQLite)에 보관하는 캐시입니다.
+    항목 수가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다. (LRU)
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 5000):
+        self.path = Path(path or Path(os.getenv("STOCK_CACHE_DIR", ".cache")) / "translations.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn: # 블록이 끝나면 커밋
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(text: str, source: str, target: str) -> str:
+        return hashlib.sha256(f"{source}\0{target}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE translations SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, value: str):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, accessed_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                "SELECT key FROM translations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+def split_into_chunks(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
+    """문장 경계를 기준으로 텍스트를 `max_chars` 이하의 조각으로 나눕니다."""
+    chunks, current = [], ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        # 한 문장이 너무 길면 글자 수 기준으로 강제로 자릅니다.
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class CachedTranslator:
+    """긴 텍스트를 조각내어 병렬로 번역하고, 결과를 TranslationCache에 저장합니다."""
+
+    def __init__(self, cache: TranslationCache | None = None, source: str = "auto", target: str = "ko", max_workers: int = 4):
+        self.cache = cache or TranslationCache()
+        self.source = source
+        self.target = target
+        self.max_workers = max_workers
+
+    def _translate_chunk(self, chunk: str) -> str:
+        # GoogleTranslator 인스턴스는 스레드마다 새로 만듭니다. (deep_translator는 실제 번역 시에만 로드)
+        GoogleTranslator = lazy_import("deep_translator").GoogleTranslator
+        with metrics.timer("translator.chunk"):
+            result = GoogleTranslator(source=self.source, target=self.target).translate(chunk)
+        if result is None:
+            raise ValueError("번역 결과가 비어 있습니다.")
+        return result
+
+    def translate(self, text: str) -> str:
+        """번역 결과를 반환합니다. 번역에 실패하면 예외를 그대로 전달하며 캐시에 저장하지 않습니다."""
+        if not text or not text.strip():
+            return text
+        key = TranslationCache.make_key(text, self.source, self.target)
+        cached = self.cache.get(key)
+        metrics.record_cache("translation", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+
+        chunks = split_into_chunks(text)
+        if len(chunks) == 1:
+            translated = self._translate_chunk(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                translated = " ".join(pool.map(self._translate_chunk, chunks))
+
+        self.cache.put(key, translated)
+        return translated
+
+
+_default_translator: CachedTranslator | None = None
+_default_translator_lock = threading.Lock()
+
+
+def get_translator() -> CachedTranslator:
+    """프로세스 전역에서 공유하는 한국어 번역기를 반환합니다."""
+    global _default_translator
+    if _default_translator is None:
+        with _default_translator_lock:
+            if _default_translator is None:
+                _default_translator = CachedTranslator()
+    return _default_translator
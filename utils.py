@@ -1,12 +1,16 @@
+import functools
 import platform
-import matplotlib.pyplot as plt
-from deep_translator import GoogleTranslator
-import requests
-import os
+
+from fx_service import get_fx_service
+from import_profiler import lazy_import
+from instrumentation import metrics, timed
+from translation_cache import get_translator
 
 # --- 한글 폰트 설정 ---
+@functools.cache # 프로세스당 한 번만 설정
 def set_korean_font():
-    """운영체제에 따라 Matplotlib 한글 폰트를 설정합니다."""
+    """운영체제에 따라 Matplotlib 한글 폰트를 설정합니다. (Matplotlib은 이 함수를 호출할 때만 로드)"""
+    plt = lazy_import("matplotlib.pyplot")
     if platform.system() == "Darwin":  # macOS
         plt.rcParams['font.family'] = 'AppleGothic'
     elif platform.system() == "Windows":
@@ -17,25 +21,25 @@ def set_korean_font():
         plt.rcParams['font.family'] = 'NanumGothic'
     plt.rcParams['axes.unicode_minus'] = False
 
+@timed("translate_to_korean")
 def translate_to_korean(text: str) -> str:
-    """영문 텍스트를 한글로 번역합니다. 번역 실패 시 오류 메시지를 반환합니다."""
+    """
+    영문 텍스트를 한글로 번역합니다. 번역 실패 시 오류 메시지를 반환합니다.
+    번역 결과는 디스크 캐시에 저장되며, 긴 텍스트는 문장 단위로 나누어 병렬 번역합니다.
+    """
     try:
-        return GoogleTranslator(source='auto', target='ko').translate(text)
+        return get_translator().translate(text)
     except Exception as e:
+        metrics.count("external_errors_total", service="translator")
         return f"(❌ 번역 실패: {e}) " + text
     
+@timed("get_today_usd_to_krw_rate")
 def get_today_usd_to_krw_rate() -> float:
-    api_key = os.getenv("ALPHA_API_KEY")
-    try:
-        url = f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency=USD&to_currency=KRW&apikey={api_key}"
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        rate = float(data["Realtime Currency Exchange Rate"]["5. Exchange Rate"])
-        return rate
-    except Exception as e:
-        print(f"AlphaVantage 환율 정보를 가져오는 데 실패했습니다: {e}")
-        return 1350.0
+    """
+    현재 USD/KRW 환율을 반환합니다.
+    프로세스 전역 환율 캐시(FXRateService)를 사용하므로 반복 호출해도 API는 TTL마다 한 번만 호출됩니다.
+    """
+    return get_fx_service().get_usd_krw_rate()
 
 def format_currency(amount: float, currency: str = "USD", rate: float | None = None) -> str:
     """
@@ -0,0 +1,171 @@
+from typing import Iterator
+
+import pandas as pd
+
+from backtest import run_backtest, sweep
+from chart import build_comparison_figure, build_price_figure
+from fx_service import get_fx_service
+from indicators import IndicatorEngine
+from llm_service import fingerprint_dataframe
+from prompt_builder import build_price_prompt
+from utils import format_currency, translate_to_korean
+
+# 화면 섹션별 표시 내용을 만드는 함수입니다. (Streamlit 호출 없음)
+# app.py의 버튼 핸들러와 벤치마크(bench/run_bench.py)가 같은 함수를 사용해 측정 대상이 화면과 어긋나지 않게 합니다.
+
+# 차트 보조지표 선택지 -> IndicatorEngine 컬럼
+OVERLAY_COLUMNS = {
+    "SMA 20": ["SMA_20"],
+    "SMA 60": ["SMA_60"],
+    "SMA 120": ["SMA_120"],
+    "볼린저 밴드": ["BB_Upper", "BB_Lower"],
+}
+
+# 파라미터 탐색(이동평균 교차) 기본 범위
+DEFAULT_SWEEP_FAST = (5, 50)
+DEFAULT_SWEEP_SLOW = (20, 200)
+DEFAULT_SWEEP_STEP = 5
+
+
+# --- 기업 정보 버튼 ---
+
+def company_overview(symbol: str, info: dict, summary_ko: str | None = None) -> tuple[str, str]:
+    """회사 기본 정보 (제목, 본문). 미리 번역한 사업 설명이 없으면 여기서 번역합니다."""
+    if summary_ko is None:
+        summary_ko = translate_to_korean(info.get('longBusinessSummary', ''))
+    employees = info.get('fullTimeEmployees', None)
+    employees_str = f"{employees:,}명" if isinstance(employees, int) else "정보 없음"
+    body = f"""
+        - **산업군**: {info.get('industry', '정보 없음')}
+        - **섹터**: {info.get('sector', '정보 없음')}
+        - **설명 (한글 번역)**: {summary_ko}
+        - **주소**: {info.get('address1', '')}, {info.get('city', '')}, {info.get('state', '')} {info.get('zip', '')}, {info.get('country', '')}
+        - **웹사이트**: [{info.get('website', '')}]({info.get('website', '')})
+        - **직원 수**: {employees_str}
+        """
+    return f"{info.get('longName', '기업명 없음')} ({symbol})", body
+
+
+def financial_summary(info: dict, rate: float) -> str:
+    return f"""
+        - **총수익**: {format_currency(info.get('totalRevenue'), "USD", rate)}
+        - **순이익**: {format_currency(info.get('netIncomeToCommon'), "USD", rate)}
+        - **영업이익률**: {info.get('operatingMargins', 0) * 100:.2f}%
+        - **배당률**: {info.get('dividendYield', 0) * 100:.2f}%
+        - **EPS**: {info.get('trailingEps', 0):.2f}
+        - **현금 보유**: {format_currency(info.get('totalCash'), "USD", rate)}
+        - **총 부채**: {format_currency(info.get('totalDebt'), "USD", rate)}
+        - **부채비율**: {info.get('debtToEquity', 0):.2f}%
+        """
+
+
+def top_officers(info: dict | None, rate: float | None, limit: int = 5) -> pd.DataFrame:
+    """연봉 상위 임원 표. 임원 정보가 없으면 빈 DataFrame을 반환합니다."""
+    officers = (info or {}).get("companyOfficers", [])
+    ranked = sorted(officers, key=lambda x: x.get('totalPay', 0), reverse=True)[:limit]
+    return pd.DataFrame([
+        {
+            "이름": officer.get("name", ""),
+            "직책": officer.get("title", ""),
+            "연봉 (USD)": format_currency(officer.get("totalPay", 0), currency="USD", rate=rate),
+        }
+        for officer in ranked
+    ])
+
+
+def investment_metrics(info: dict) -> str:
+    return f"""
+        - **PER (Trailing)**: {info.get('trailingPE', 0):.2f}
+        - **PER (Forward)**: {info.get('forwardPE', 0):.2f}
+        - **PBR**: {info.get('priceToBook', 0):.2f}
+        - **ROE**: {info.get('returnOnEquity', 0) * 100:.2f}%
+        - **ROA**: {info.get('returnOnAssets', 0) * 100:.2f}%
+        - **Beta**: {info.get('beta', 0):.2f}
+        """
+
+
+def market_summary(info: dict, rate: float) -> str:
+    return f"""
+        - **현재가**: ${info.get('currentPrice', 0):.2f}
+        - **전일 종가**: ${info.get('previousClose', 0):.2f}
+        - **고가 / 저가 (당일)**: \\${info.get('dayHigh', 0):.2f} / \\${info.get('dayLow', 0):.2f}
+        - **52주 최고 / 최저**: \\${info.get('fiftyTwoWeekHigh', 0):.2f} / \\${info.get('fiftyTwoWeekLow', 0):.2f}
+        - **시가총액**:  {format_currency(info.get('marketCap'), "USD", rate)}
+        - **유통주식수**: {info.get('sharesOutstanding', 0):,}주
+        - **거래량 (당일)**: {info.get('volume', 0):,}주
+        """
+
+
+def analyst_opinion(info: dict) -> str:
+    return f"""
+        - **추천 평균 등급**: {info.get('recommendationMean', 'N/A')} ({info.get('recommendationKey', 'N/A')})
+        - **분석가 수**: {info.get('numberOfAnalystOpinions', 'N/A')}
+        - **목표 주가 평균**: ${info.get('targetMeanPrice', 0):.2f}
+        - **목표 주가 상/하**: ${info.get('targetHighPrice', 0):.2f} / ${info.get('targetLowPrice', 0):.2f}
+        """
+
+
+# --- 주가 히스토리 ---
+
+def load_price_history(data_manager, symbol: str, start: str, end: str,
+                       snapshot=None) -> tuple[pd.DataFrame | None, str | None]:
+    """
+    구간 주가를 조회해 (정리된 주가 DataFrame, 실제 마지막 거래일)을 반환합니다. 데이터가 없으면 (None, None)입니다.
+    기본 구간은 종목 입력 시 미리 조회해 둔 스냅샷 결과를 사용합니다.
+    """
+    if snapshot is not None and (start, end) == snapshot.price_window:
+        raw_df, adjusted_end = snapshot.get("price") or (None, None)
+    else:
+        raw_df, adjusted_end = data_manager.get_price_data_adjusted(symbol, start, end)
+    if raw_df is None or raw_df.empty:
+        return None, None
+    # 숫자형을 유지한 채 컬럼만 정리 (원본 복사본을 따로 두지 않음)
+    return data_manager.process_price_df(raw_df), adjusted_end
+
+
+def price_chart(chart_window: pd.DataFrame, engine: IndicatorEngine | None = None, overlays=(),
+                show_krw: bool = False):
+    """주가 차트. 원화 환산 시 일별 환율을 곱하고, 보조지표도 같은 비율로 환산합니다."""
+    chart_df = get_fx_service().convert_to_krw(chart_window) if show_krw else chart_window
+
+    overlay_columns = [column for overlay in overlays for column in OVERLAY_COLUMNS[overlay]]
+    overlay_df = None
+    if overlay_columns and engine is not None:
+        overlay_df = engine.values.loc[chart_window.index, overlay_columns]
+        if show_krw:
+            overlay_df = overlay_df.mul(chart_df["Close"] / chart_window["Close"], axis=0)
+    return build_price_figure(chart_df, overlay_df)
+
+
+# --- 전략 백테스트 ---
+
+def run_strategies(price_df: pd.DataFrame, strategy_names, params: dict[str, dict] | None = None) -> list:
+    return [run_backtest(price_df, name, **(params or {}).get(name, {})) for name in strategy_names]
+
+
+def ma_sweep(price_df: pd.DataFrame, fast_range=DEFAULT_SWEEP_FAST, slow_range=DEFAULT_SWEEP_SLOW,
+             step: int = DEFAULT_SWEEP_STEP) -> pd.DataFrame:
+    """이동평균 교차 전략의 (단기, 장기) 범위 조합을 탐색합니다."""
+    grid = {
+        "fast": list(range(fast_range[0], fast_range[1] + 1, int(step))),
+        "slow": list(range(slow_range[0], slow_range[1] + 1, int(step))),
+    }
+    return sweep(price_df, "ma_crossover", grid)
+
+
+def backtest_report(results: list) -> tuple:
+    """자산 곡선을 누적 수익률(%)로 바꾼 비교 차트와 성과 요약 표"""
+    equity_returns = pd.DataFrame({r.label: (r.equity - 1) * 100 for r in results})
+    return build_comparison_figure(equity_returns), pd.DataFrame([r.summary() for r in results])
+
+
+# --- AI Q&A ---
+
+def stream_ai_answer(ai_service, symbol: str, start, end, price_df: pd.DataFrame, question: str,
+                     indicators=None, backtests=None, model: str = "gpt-4o") -> Iterator[str]:
+    """
+    조회한 데이터 기반 AI 답변을 토큰 단위로 반환합니다.
+    전체 데이터를 그대로 넣지 않고, 요약 통계 + 과거 구간 리샘플링 + 최근 일봉으로 토큰 예산 안에서 프롬프트를 구성합니다.
+    """
+    prompt = build_price_prompt(symbol, start, end, price_df, question, indicators=indicators, backtests=backtests)
+    return ai_service.stream_qa_response(prompt, model=model, data_fingerprint=fingerprint_dataframe(price_df))